@@ -1,20 +1,41 @@
 from model.Model import Model 
-from view.View import View
 from controller.Controller import Controller
+from profiling.Profile import Profiler
+from random import Random
+import argparse
 
 
 class App:
 
-    def __init__(self):
+    def __init__(self, seed=None, profile=False):
+        # choose the session seed (printed so the session can be repeated with --seed)
+        self.seed = seed if seed != None else Random().getrandbits(32)
+        print(f"Seed: {self.seed}")
+
         # create a model to be called by the controller
-        self.model = Model()
+        self.model = Model(Random(f"{self.seed}/model"))
         
         # create a controller for view and model to interact with
-        self.controller = Controller(self.model)
+        self.controller = Controller(self.model, self.seed)
 
         # create a view and place it on the root window
-        self.view = View(self.controller)
+        from view.View import View  # Loads tkinter only once the GUI is actually started
+        if not(profile):
+            self.view = View(self.controller)
+            return
+
+        # profile the whole session, then write the report next to log.txt
+        profiler = Profiler("./log.profile")
+        with profiler.profile():
+            self.view = View(self.controller, profiler)
+        for path in profiler.write(f"python app.py --seed {self.seed} --profile"):
+            print(f"Wrote {path}")
 
 
 if __name__ == '__main__':
-    app = App()
+    parser = argparse.ArgumentParser(description="Wave collapse function Sudoku generator.")
+    parser.add_argument("--seed", type=int, default=None, help="repeat a session (random if omitted)")
+    parser.add_argument("--profile", action="store_true", help="profile the session and write log.profile.pstats and log.profile.txt")
+    args = parser.parse_args()
+
+    app = App(args.seed, args.profile)
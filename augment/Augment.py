@@ -0,0 +1,137 @@
+"""
+Derives many valid boards from one generated board.
+
+Relabeling the digits, shuffling rows within a band, shuffling the bands,
+doing the same for columns and stacks, and transposing all keep a board
+valid, so each result of the (comparatively slow) wave collapse function
+can be turned into a large family of boards with index permutations alone.
+
+NumPy is optional: augmentBatch() uses it to build a whole batch with one
+gather, and everything else runs on plain lists.
+"""
+from math import isqrt      # For the square root function
+from random import Random
+from typing import List
+
+
+def randomPermutation(size: int, rng: Random):
+    """
+    Returns a permutation of range(size) that only moves lines within their
+    band and moves whole bands (so the subsquares stay intact).
+    """
+    band_size = isqrt(size)
+    bands = list(range(band_size))
+    rng.shuffle(bands)
+
+    permutation = []
+    for band in bands:
+        lines = [ band * band_size + i for i in range(band_size) ]
+        rng.shuffle(lines)
+        permutation += lines
+    return permutation
+
+
+def randomTransform(size: int, rng: Random):
+    """
+    Returns a random (relabel, column_order, row_order, transpose) transform.
+    relabel[value] is the new value (relabel[0] is unused).
+    """
+    relabel = list(range(1, size+1))
+    rng.shuffle(relabel)
+    relabel = [0] + relabel
+
+    return (relabel, randomPermutation(size, rng), randomPermutation(size, rng), rng.random() < 0.5)
+
+
+def applyTransform(grid: List[List[int]], transform: tuple):
+    """
+    Returns a new grid[x][y] with the transform applied.
+    """
+    relabel, column_order, row_order, transpose = transform
+    if transpose:
+        return [ [ relabel[grid[y][x]] for y in row_order ] for x in column_order ]
+    return [ [ relabel[grid[x][y]] for y in row_order ] for x in column_order ]
+
+
+def canonicalForm(grid: List[List[int]]):
+    """
+    Returns the board as a tuple with its digits renamed in order of first
+    appearance (reading grid[0], then grid[1], ...). Two boards with the
+    same canonical form are the same board up to relabeling.
+    """
+    names = {}
+    form = []
+    for column in grid:
+        for value in column:
+            if value not in names:
+                names[value] = len(names) + 1
+            form.append(names[value])
+    return tuple(form)
+
+
+def augmentBoard(grid: List[List[int]], count: int, seed=None, dedupe_relabels=False):
+    """
+    Yields up to count distinct boards derived from grid, including none that
+    equal it. With dedupe_relabels, boards that only differ from an earlier
+    one by relabeling are skipped too (compared by canonical form).
+    """
+    rng = Random(seed)
+    size = len(grid)
+    seen = { canonicalForm(grid) if dedupe_relabels else tuple(value for column in grid for value in column) }
+
+    # Give up after plenty of repeats (tiny boards only have so many relatives)
+    attempts = 0
+    produced = 0
+    while produced < count and attempts < count * 10:
+        attempts += 1
+        board = applyTransform(grid, randomTransform(size, rng))
+
+        key = canonicalForm(board) if dedupe_relabels else tuple(value for column in board for value in column)
+        if key in seen:
+            continue
+
+        seen.add(key)
+        produced += 1
+        yield board
+
+
+def dedupeBoards(boards):
+    """
+    Passes on boards whose canonical form hasn't been seen yet.
+    """
+    seen = set()
+    for board in boards:
+        form = canonicalForm(board)
+        if form not in seen:
+            seen.add(form)
+            yield board
+
+
+def augmentBatch(grid: List[List[int]], count: int, seed=None):
+    """
+    Builds count transformed boards at once with NumPy.
+    Returns an array of shape (count, size, size) indexed as [board, x, y].
+    Duplicates are not removed; pass the rows through dedupeBoards() if needed.
+    Needs the optional numpy requirement (requirements-optional.txt).
+    """
+    import numpy    # Optional; only needed for batches
+
+    rng = Random(seed)
+    size = len(grid)
+    board = numpy.asarray(grid, dtype=numpy.uint8)
+
+    relabels = numpy.empty((count, size+1), dtype=numpy.uint8)
+    columns = numpy.empty((count, size), dtype=numpy.intp)
+    rows = numpy.empty((count, size), dtype=numpy.intp)
+    transposes = numpy.empty(count, dtype=bool)
+    for i in range(count):
+        relabel, column_order, row_order, transpose = randomTransform(size, rng)
+        relabels[i] = relabel
+        columns[i] = column_order
+        rows[i] = row_order
+        transposes[i] = transpose
+
+    # Gather every board with one fancy index per orientation
+    sources = numpy.where(transposes[:, None, None], board.T[None], board[None])
+    boards = sources[numpy.arange(count)[:, None, None], columns[:, :, None], rows[:, None, :]]
+    return numpy.take_along_axis(relabels[:, None, :], boards.reshape(count, 1, size * size).astype(numpy.intp), axis=2).reshape(count, size, size)
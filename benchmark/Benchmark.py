@@ -0,0 +1,227 @@
+"""
+Benchmarks for board generation.
+
+    python -m benchmark.Benchmark                       # run and compare to the baseline
+    python -m benchmark.Benchmark --out results.json    # also save the results
+    python -m benchmark.Benchmark --update-baseline     # make these results the baseline
+
+Every size is generated from the same fixed seeds each time, so the step,
+node, and backtrack counts only change when the search itself changes, and
+the times can be compared between runs. Each board is generated REPEAT times
+and its fastest time is kept, since a single run of a few milliseconds is
+mostly noise. 36x36 and 49x49 run once under a time budget and are reported
+as timed out if they don't finish. The hot engine methods are also timed on
+their own, keeping the fastest of REPEAT rounds.
+
+Exits with status 1 if the total time of any size (over its seeds), or the
+time of any method, is more than threshold times its baseline.
+"""
+from generator.Generator import Generator, defaultOptions
+from model.Model import Model
+from tile.Tile import Tile
+from math import isqrt      # For the square root function
+from random import Random
+import argparse
+import json
+import os
+import sys
+import time
+import timeit
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+SEEDS = [1, 2, 3]
+SIZES = [4, 9, 16, 25]
+BUDGET_SIZES = [36, 49]
+REPEAT = 5              # Runs of each board and rounds of each method; the fastest is kept
+MIN_SLOWDOWN = 0.01     # Seconds a size has to slow down by to count as a regression
+
+
+def benchmarkGeneration(size: int, seed: int, time_budget=None, repeat=REPEAT):
+    """
+    Generates one board repeat times (the search is the same every time),
+    counting its steps and the deepest history it reached.
+    Returns a dict of measurements, with the fastest of the wall times.
+    """
+    wall_times = []
+    for i in range(repeat):
+        generator = Generator(size, seed, time_budget=time_budget, **defaultOptions(size))
+        steps = 0
+        timed_out = False
+
+        start = time.perf_counter()
+        try:
+            for change in generator.steps():
+                steps += 1
+        except TimeoutError:
+            timed_out = True
+        wall_times.append(time.perf_counter() - start)
+
+        if timed_out:   # Another try would only time out again
+            break
+
+    return {
+        "seed": seed,
+        "wall_time": min(wall_times),
+        "steps": steps,
+        "nodes": generator.nodes,
+        "backtracks": generator.backtracks,
+        "restarts": generator.restarts,
+        "peak_history": generator.metrics.max_depth,
+        "timed_out": timed_out,
+    }
+
+
+def benchmarkSizes(sizes, budget_sizes, time_budget: float):
+    """
+    Benchmarks every seed of every size.
+    Returns a dict of size -> list of measurements.
+    """
+    results = {}
+    for size in sizes + budget_sizes:
+        budget = time_budget if size in budget_sizes else None
+        repeat = 1 if size in budget_sizes else REPEAT
+        results[str(size)] = [ benchmarkGeneration(size, seed, budget, repeat) for seed in SEEDS ]
+        print(f"{size}x{size}: {sum(run['wall_time'] for run in results[str(size)]):.3f}s", file=sys.stderr)
+    return results
+
+
+def makeTileGrid(size: int, rng: Random):
+    """
+    Returns a data-only Tile grid with about half of its Tiles collapsed, for the micro benchmarks.
+    """
+    subsquare_size = isqrt(size)
+    tile_grid = [ [ Tile(None, None, (x // subsquare_size, y // subsquare_size), size, x, y)
+                    for y in range(size) ] for x in range(size) ]
+    for column in tile_grid:
+        for tile in column:
+            if rng.random() < 0.5:
+                tile.collapsed = True
+                tile.value = rng.randint(1, size)
+    return tile_grid
+
+
+def benchmarkMethods(size=16, number=1000, repeat=REPEAT):
+    """
+    Times the hot engine methods on their own, keeping the fastest of repeat rounds.
+    Returns a dict of method -> microseconds per call.
+    """
+    rng = Random(0)
+    model = Model(Random(0))
+    tile_grid = makeTileGrid(size, rng)
+
+    # A Generator part way through a board, for propagating from and reversing back to
+    generator = Generator(size, seed=0)
+    steps = generator.steps()
+    for i in range(size * size // 2):
+        next(steps)
+    uncollapsed = [ tile for column in generator.tile_grid for tile in column if not(tile.collapsed) ]
+    tile = uncollapsed[0]
+    value = max(tile.entropy.bit_length(), 1)
+
+    def propagateAndReverse():
+        trail_mark = len(generator.trail)
+        generator.propagateEntropy(tile, value)
+        generator.reverseEntropy(trail_mark)
+
+    def propagateOnly():
+        trail_mark = len(generator.trail)
+        start = time.perf_counter()
+        generator.propagateEntropy(tile, value)
+        seconds = time.perf_counter() - start
+        generator.reverseEntropy(trail_mark)
+        return seconds
+
+    def reverseOnly():
+        trail_mark = len(generator.trail)
+        generator.propagateEntropy(tile, value)
+        start = time.perf_counter()
+        generator.reverseEntropy(trail_mark)
+        return time.perf_counter() - start
+
+    timings = {
+        "getValidTiles": min(timeit.repeat(lambda: model.getValidTiles(tile_grid), number=number, repeat=repeat)),
+        "propagateEntropy+reverseEntropy": min(timeit.repeat(propagateAndReverse, number=number, repeat=repeat)),
+        "propagateEntropy": min(sum(propagateOnly() for i in range(number)) for j in range(repeat)),
+        "reverseEntropy": min(sum(reverseOnly() for i in range(number)) for j in range(repeat)),
+        "chooseRandomValue": min(timeit.repeat(lambda: model.chooseRandomValue(tile, []), number=number, repeat=repeat)),
+    }
+    steps.close()
+    return { name: seconds / number * 1e6 for name, seconds in timings.items() }
+
+
+def compareToBaseline(results: dict, baseline: dict, threshold: float):
+    """
+    Compares results to a baseline.
+    Returns a list of regression messages (empty if there are none).
+    """
+    regressions = []
+
+    for size, runs in results["generation"].items():
+        run_total = 0.0
+        base_total = 0.0
+        for run, base in zip(runs, baseline.get("generation", {}).get(size, [])):
+            if run["timed_out"] or base["timed_out"]:
+                if run["timed_out"] and not(base["timed_out"]):
+                    regressions.append(f"{size}x{size} seed {run['seed']}: timed out (baseline {base['wall_time']:.3f}s)")
+                continue
+            run_total += run["wall_time"]
+            base_total += base["wall_time"]
+            if run["steps"] != base["steps"]:
+                print(f"{size}x{size} seed {run['seed']}: search changed ({base['steps']} -> {run['steps']} steps)", file=sys.stderr)
+
+        # Compare the size as a whole; tiny boards take microseconds, so also require a noticeable difference
+        if run_total > base_total * threshold and run_total - base_total > MIN_SLOWDOWN:
+            regressions.append(f"{size}x{size}: {run_total:.3f}s over {len(runs)} seeds (baseline {base_total:.3f}s)")
+
+    for name, micros in results["methods"].items():
+        base = baseline.get("methods", {}).get(name)
+        if base != None and micros > base * threshold:
+            regressions.append(f"{name}: {micros:.2f}us per call (baseline {base:.2f}us)")
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark board generation.")
+    parser.add_argument("--out", default=None, help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.5, help="allowed slowdown factor before a time counts as a regression")
+    parser.add_argument("--time-budget", type=float, default=20, help="seconds allowed per 36x36 and 49x49 board")
+    parser.add_argument("--sizes", type=int, nargs="*", default=None, help="only benchmark these sizes")
+    parser.add_argument("--update-baseline", action="store_true", help="save the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    sizes = SIZES if args.sizes == None else [ size for size in args.sizes if size not in BUDGET_SIZES ]
+    budget_sizes = BUDGET_SIZES if args.sizes == None else [ size for size in args.sizes if size in BUDGET_SIZES ]
+
+    results = {
+        "python": sys.version.split()[0],
+        "generation": benchmarkSizes(sizes, budget_sizes, args.time_budget),
+        "methods": benchmarkMethods(),
+    }
+
+    if args.out != None:
+        with open(args.out, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(results, file, indent=2)
+        return 0
+
+    if not(os.path.exists(args.baseline)):
+        print("No baseline to compare against.", file=sys.stderr)
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+
+    regressions = compareToBaseline(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
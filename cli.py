@@ -0,0 +1,107 @@
+"""
+A headless command line for generating boards in bulk:
+
+    python cli.py generate --size 16 --count 100000 --out boards.txt
+    python cli.py generate --size 9 --count 1000 --out puzzles.txt --gamify
+
+Boards are streamed to the file as they finish, in board order, and the file
+is flushed every few boards. Running the same command again after an
+interruption picks up after the last complete board; every board's seed is
+derived from the master seed and its index, so a resumed file holds exactly
+the boards an uninterrupted run would have written (as long as the same
+propagation and restart options are given).
+
+Files ending in .bin (or written with --format bin) use the packed binary
+format of corpus/Packed.py; anything else is the text format of corpus/Text.py.
+
+With --profile, the boards are generated in this process under cProfile,
+and the stats and a per-phase report are written next to the output file
+(<out>.profile.pstats and <out>.profile.txt).
+"""
+from corpus.Packed import PackedWriter
+from corpus.Text import TextWriter
+from generator.Batch import boardSeed, generateOrdered
+from profiling.Profile import Profiler
+from math import floor
+import argparse
+import sys
+
+
+def generatorOptions(args):
+    """
+    Returns the Generator options given on the command line; the rest keep
+    the Generator's defaults for the board size.
+    """
+    names = ["naked_singles", "hidden_singles", "naked_pairs", "restart_policy", "restart_base"]
+    return { name: getattr(args, name) for name in names if getattr(args, name) != None }
+
+
+def generateCommand(args):
+    """
+    Streams args.count boards (and puzzles, with --gamify) to args.out.
+    """
+    size = args.size
+    num_to_remove = floor(size * size * args.remove) if args.gamify else 0
+
+    file_format = args.format or ("bin" if args.out.endswith(".bin") else "text")
+    writer_class = PackedWriter if file_format == "bin" else TextWriter
+    writer = writer_class(args.out, size, args.seed, num_to_remove)
+    seed = writer.seed
+    done = writer.count
+
+    print(f"Seed: {seed}, boards already written: {done}", file=sys.stderr)
+
+    seeds = (boardSeed(seed, index) for index in range(done, args.count))
+    options = generatorOptions(args)
+    try:
+        for board_seed, puzzle, grid in generateOrdered(size, seeds, args.workers, num_to_remove=num_to_remove, options=options):
+            writer.write(board_seed, puzzle, grid)
+            if writer.count % args.flush_every == 0:
+                writer.flush()
+                print(f"{writer.count}/{args.count}", file=sys.stderr)
+    finally:
+        writer.close()
+
+
+def makeParser():
+    parser = argparse.ArgumentParser(description="Headless Sudoku board generation.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="stream boards to a file")
+    generate.add_argument("--size", type=int, required=True, choices=[4, 9, 16, 25, 36, 49])
+    generate.add_argument("--count", type=int, required=True, help="total number of boards in the file")
+    generate.add_argument("--out", required=True, help="output file (resumed if it already exists)")
+    generate.add_argument("--seed", type=int, default=None, help="master seed (random if omitted)")
+    generate.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    generate.add_argument("--gamify", action="store_true", help="also write a uniquely solvable puzzle per board")
+    generate.add_argument("--remove", type=float, default=0.63, help="share of Tiles to clear with --gamify")
+    generate.add_argument("--format", choices=["text", "bin"], default=None, help="file format (default: bin for .bin files, else text)")
+    generate.add_argument("--naked-singles", action=argparse.BooleanOptionalAction, default=None, help="collapse Tiles with one value left (default: on for 25x25 and up)")
+    generate.add_argument("--hidden-singles", action=argparse.BooleanOptionalAction, default=None, help="collapse values with one place left in a unit (default: on for 25x25 and up)")
+    generate.add_argument("--naked-pairs", action=argparse.BooleanOptionalAction, default=None, help="remove naked pairs from the rest of their unit")
+    generate.add_argument("--restart-policy", choices=["luby", "geometric"], default=None, help="restart schedule (default: luby)")
+    generate.add_argument("--restart-base", type=int, default=None, help="backtracks per unit of the restart schedule (default: 100)")
+    generate.add_argument("--flush-every", type=int, default=100, help="boards between flushes")
+    generate.add_argument("--profile", action="store_true", help="profile the generation (in a single process)")
+    generate.set_defaults(run=generateCommand)
+
+    return parser
+
+
+def main(argv=None):
+    args = makeParser().parse_args(argv)
+    if not(args.profile):
+        args.run(args)
+        return
+
+    # Worker processes can't be profiled from here, so generate in this one
+    args.workers = 1
+    profiler = Profiler(f"{args.out}.profile")
+    with profiler.profile():
+        args.run(args)
+    for path in profiler.write(f"python cli.py {' '.join(argv if argv != None else sys.argv[1:])}"):
+        print(f"Wrote {path}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
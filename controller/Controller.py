@@ -1,11 +1,28 @@
 from model.Model import Model
+from generator.Generator import Generator, defaultOptions
+from generator.DancingLinks import DancingLinksGenerator
+from random import Random
 from typing import List
 from tile.Tile import Tile # For type verification
 
 class Controller():
 
-    def __init__(self, model: Model):
+    def __init__(self, model: Model, seed=None):
+        """
+        Every Generator made without a seed gets one drawn from a Random
+        seeded with seed (a random seed if None), so a session started with
+        the same seed generates the same boards in the same order.
+        """
         self.model = model
+        self.seed = seed if seed != None else Random().getrandbits(32)
+        self.seed_stream = Random(self.seed)
+
+
+    def nextSeed(self):
+        """
+        Returns the seed for the next board of this session.
+        """
+        return self.seed_stream.getrandbits(32)
 
     
     def randomTile(self, tile_grid: List[List[Tile]]):
@@ -38,10 +55,68 @@ class Controller():
 
     def getGamifyTiles(self, num_to_remove: int, tile_grid: List[List[Tile]]):
         """
-        Has the model produce a list of unique Tile coordinates.
+        Has the model produce a list of unique Tile coordinates to clear,
+        leaving a puzzle with exactly one solution.
         Returns a list of (x, y) tuples.
         """
         # Get list of Tile coords from the model
         tile_coords = self.model.produceGamifyTiles(num_to_remove, tile_grid)
 
         return tile_coords
+
+
+    def streamGamifyTiles(self, num_to_remove: int, grid: List[List[int]]):
+        """
+        The same as getGamifyTiles(), but for a grid of values, yielding
+        each (x, y) tuple as soon as the model has checked it.
+        """
+        return self.model.iterGamifyCoords(num_to_remove, grid)
+
+
+    def makeGenerator(self, size: int, seed=None, backend="wave", **options):
+        """
+        Creates a headless Generator for a board of the given size.
+        The View consumes the changes it produces.
+
+        backend is either 'wave' (the wave collapse function) or 'dlx'
+        (Dancing Links exact cover). Any options (restart policy, budgets,
+        propagation rules, ...) are passed through to the wave Generator,
+        on top of its defaultOptions() for the size; the dlx backend takes
+        none and raises if any are given.
+        Without a seed, the next seed of the session is used.
+        """
+        if seed == None:
+            seed = self.nextSeed()
+        if backend == "wave":
+            return Generator(size, seed, **{ **defaultOptions(size), **options })
+        if backend == "dlx":
+            return DancingLinksGenerator(size, seed, **options)
+        raise Exception("Invalid Backend!")
+
+
+    def generateSudoku(self, size: int, seed=None, backend="wave"):
+        """
+        Generates a complete board of the given size without a GUI.
+        Returns a (seed, grid) tuple: the seed the board was generated from
+        and the solved grid of values, indexed as grid[x][y].
+        """
+        generator = self.makeGenerator(size, seed, backend)
+        return (generator.seed, generator.generate())
+
+
+    def generateMany(self, size: int, count: int, workers=None, seed=None, options=None):
+        """
+        Generates count boards across a pool of worker processes.
+        Yields (board_seed, grid) tuples in the order the boards finish.
+        """
+        from generator.Batch import generateMany   # Process pools are only loaded when used
+        return generateMany(size, count, workers, seed, options=options)
+
+
+    def raceGenerate(self, size: int, racers=None, seed=None, time_budget=None, options=None):
+        """
+        Races differently seeded Generators in separate processes.
+        Returns the first finished board as a (seed, value_order, grid) tuple.
+        """
+        from generator.Portfolio import raceGenerate
+        return raceGenerate(size, racers, seed, time_budget, options=options)
@@ -0,0 +1,264 @@
+"""
+A packed binary board file and a memory-mapped reader for it.
+
+The file is a fixed 32 byte header followed by fixed-size records:
+
+    header: magic "SWCF", version, size, cell bits, flags,
+            record count (uint64), master seed (uint64), Tiles removed (uint32)
+    record: board seed (uint64), solution cells, [given mask]
+
+Boards up to 16x16 store value - 1 in 4 bits per cell (two cells per byte);
+25x25 to 49x49 store the value itself in one byte per cell, so the reader can
+hand out a zero-copy NumPy view of them. When puzzles are stored (flag bit 0),
+the given mask has one bit per cell saying whether the puzzle shows it.
+Cells are in grid[x][y] order, x first. All integers are little-endian.
+"""
+from mmap import mmap, ACCESS_READ
+from random import Random
+from typing import List
+import os
+import struct
+
+
+MAGIC = b"SWCF"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBBQQI4x")
+SEED = struct.Struct("<Q")
+HAS_PUZZLES = 1
+
+
+def cellBits(size: int):
+    """
+    Returns the bits each cell takes for a board size.
+    """
+    return 4 if size <= 16 else 8
+
+
+def recordSize(size: int, has_puzzles: bool):
+    """
+    Returns the bytes one record takes.
+    """
+    cells = size * size
+    cell_bytes = (cells + 1) // 2 if cellBits(size) == 4 else cells
+    mask_bytes = (cells + 7) // 8 if has_puzzles else 0
+    return SEED.size + cell_bytes + mask_bytes
+
+
+def packGrid(grid: List[List[int]]):
+    """
+    Packs a solved grid[x][y] into its cell bytes.
+    """
+    cells = [ value for column in grid for value in column ]
+    if cellBits(len(grid)) == 8:
+        return bytes(cells)
+
+    if len(cells) % 2:
+        cells.append(1)     # Pad the last nibble
+    return bytes( ((cells[i] - 1) << 4) | (cells[i+1] - 1) for i in range(0, len(cells), 2) )
+
+
+def unpackGrid(data, size: int):
+    """
+    Unpacks cell bytes into a grid[x][y] of values.
+    """
+    if cellBits(size) == 8:
+        cells = list(data[:size * size])
+    else:
+        cells = []
+        for byte in data:
+            cells.append((byte >> 4) + 1)
+            cells.append((byte & 15) + 1)
+
+    return [ cells[x * size:(x + 1) * size] for x in range(size) ]
+
+
+def packMask(puzzle: List[List[int]]):
+    """
+    Packs which Tiles of a puzzle are given into a bitset (bit i is cell i).
+    """
+    mask = 0
+    for i, value in enumerate(value for column in puzzle for value in column):
+        if value:
+            mask |= 1 << i
+    return mask.to_bytes((len(puzzle) ** 2 + 7) // 8, "little")
+
+
+class PackedWriter():
+    """
+    Appends records to a packed board file, creating it (with the given seed, or a
+    random one, and number of removed Tiles) or resuming an existing one. A partly written
+    last record is cut off, so count is always the number of complete boards.
+    """
+    def __init__(self, file_path: str, size: int, seed=None, num_to_remove=0):
+        self.file_path = file_path
+        self.size = size
+        self.num_to_remove = num_to_remove
+        self.has_puzzles = num_to_remove > 0
+        self.record_size = recordSize(size, self.has_puzzles)
+
+        if os.path.exists(file_path) and os.path.getsize(file_path) >= HEADER.size:
+            self.file = open(file_path, "rb+")
+            magic, version, file_size, bits, flags, count, file_seed, removed = HEADER.unpack(self.file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise Exception(f"{file_path} is not a board file!")
+            if file_size != size or removed != num_to_remove or (seed != None and file_seed != seed):
+                raise Exception(f"{file_path} holds a different batch!")
+
+            self.seed = file_seed
+            self.count = (os.path.getsize(file_path) - HEADER.size) // self.record_size
+            self.file.truncate(HEADER.size + self.count * self.record_size)
+            self.file.seek(0, os.SEEK_END)
+        else:
+            self.file = open(file_path, "wb+")
+            self.seed = seed if seed != None else Random().getrandbits(32)
+            self.count = 0
+            self.writeHeader()
+
+
+    def writeHeader(self):
+        """
+        Writes the header (with the current count) at the start of the file.
+        """
+        position = self.file.tell()
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.size, cellBits(self.size),
+                                    HAS_PUZZLES if self.has_puzzles else 0,
+                                    self.count, self.seed, self.num_to_remove))
+        self.file.seek(max(position, HEADER.size))
+
+
+    def write(self, board_seed: int, puzzle, grid: List[List[int]]):
+        """
+        Appends one board (and, if the file stores puzzles, its given mask).
+        """
+        record = SEED.pack(board_seed) + packGrid(grid)
+        if self.has_puzzles:
+            record += packMask(puzzle)
+        self.file.write(record)
+        self.count += 1
+
+
+    def flush(self):
+        """
+        Updates the header count and pushes everything written so far to disk.
+        """
+        self.writeHeader()
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+class PackedCorpus():
+    """
+    Random access to the boards of a packed file without loading it: the file
+    is memory-mapped and each record is decoded only when asked for.
+    """
+    def __init__(self, file_path: str):
+        self.file = open(file_path, "rb")
+        self.map = mmap(self.file.fileno(), 0, access=ACCESS_READ)
+
+        magic, version, size, bits, flags, count, seed, removed = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise Exception(f"{file_path} is not a board file!")
+
+        self.size = size
+        self.seed = seed
+        self.num_to_remove = removed
+        self.has_puzzles = bool(flags & HAS_PUZZLES)
+        self.record_size = recordSize(size, self.has_puzzles)
+        self.cell_bytes = (size * size + 1) // 2 if bits == 4 else size * size
+
+        # Count the complete records on disk (the header count is only updated on flush)
+        self.count = (len(self.map) - HEADER.size) // self.record_size
+
+
+    def __len__(self):
+        return self.count
+
+
+    def offset(self, index: int):
+        """
+        Returns where the index-th record starts.
+        """
+        if index < 0:
+            index += self.count
+        if not(0 <= index < self.count):
+            raise IndexError("Board index out of range!")
+        return HEADER.size + index * self.record_size
+
+
+    def __getitem__(self, index: int):
+        """
+        Returns the solved grid[x][y] of the index-th board.
+        """
+        start = self.offset(index) + SEED.size
+        return unpackGrid(self.map[start:start + self.cell_bytes], self.size)
+
+
+    def boardSeed(self, index: int):
+        """
+        Returns the seed the index-th board was generated from.
+        """
+        return SEED.unpack_from(self.map, self.offset(index))[0]
+
+
+    def puzzle(self, index: int):
+        """
+        Returns the puzzle of the index-th board, with None for cleared Tiles.
+        """
+        if not(self.has_puzzles):
+            raise Exception("This board file has no puzzles!")
+
+        start = self.offset(index) + SEED.size + self.cell_bytes
+        mask = int.from_bytes(self.map[start:start + self.record_size - SEED.size - self.cell_bytes], "little")
+        grid = self[index]
+        return [ [ value if mask >> (x * self.size + y) & 1 else None for y, value in enumerate(column) ]
+                 for x, column in enumerate(grid) ]
+
+
+    def array(self, index: int):
+        """
+        Returns the index-th solution as a (size, size) NumPy array indexed [x, y].
+        Byte cells (25x25 and up) are a zero-copy view into the file (which
+        keeps the map open after close() until the view is gone); 4-bit
+        cells have to be unpacked into a new array.
+        Needs the optional numpy requirement (requirements-optional.txt).
+        """
+        import numpy    # Optional; only needed for arrays
+
+        start = self.offset(index) + SEED.size
+        cells = numpy.frombuffer(self.map, dtype=numpy.uint8, count=self.cell_bytes, offset=start)
+        if self.cell_bytes == self.size * self.size:
+            return cells.reshape(self.size, self.size)
+
+        nibbles = numpy.empty(self.cell_bytes * 2, dtype=numpy.uint8)
+        nibbles[0::2] = cells >> 4
+        nibbles[1::2] = cells & 15
+        return (nibbles[:self.size * self.size] + 1).reshape(self.size, self.size)
+
+
+    def close(self):
+        """
+        Closes the file. An mmap can't be closed while views of it (from
+        array()) are alive, so in that case the map is only let go of, and
+        is closed once the last view is garbage collected.
+        """
+        if self.map != None:
+            try:
+                self.map.close()
+            except BufferError:
+                pass
+            self.map = None
+        self.file.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
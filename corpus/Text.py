@@ -0,0 +1,113 @@
+"""
+A plain text board file: a header line, then one line per board.
+
+    # sudoku size=9 seed=1234 remove=51
+    <board seed>\t[<puzzle>\t]<solution>
+
+Each grid is its values indexed as grid[x][y], flattened x first and
+separated by commas (0 marks an empty Tile). The puzzle column is only
+there when Tiles were removed.
+"""
+from random import Random
+from typing import List
+import os
+
+
+def formatGrid(grid: List[List[int]]):
+    """
+    Flattens grid[x][y] into a comma-separated line fragment (0 for empty Tiles).
+    """
+    return ",".join(str(value or 0) for column in grid for value in column)
+
+
+def formatHeader(size: int, seed: int, num_to_remove: int):
+    return f"# sudoku size={size} seed={seed} remove={num_to_remove}\n"
+
+
+def readHeader(file_path: str):
+    """
+    Returns the header of an existing board file as a dict of ints,
+    or None if the file is missing or empty.
+    """
+    if not(os.path.exists(file_path)) or os.path.getsize(file_path) == 0:
+        return None
+
+    with open(file_path, "r") as file:
+        line = file.readline()
+    if not(line.startswith("# sudoku ")) or not(line.endswith("\n")):
+        raise Exception(f"{file_path} is not a board file!")
+
+    return { key: int(value) for key, value in (field.split("=") for field in line.split()[2:]) }
+
+
+def countRecords(file_path: str):
+    """
+    Counts the complete board lines of an existing board file, cutting off
+    a partly written last line (left by an interruption) so writing can resume.
+    """
+    records = 0
+    end = 0         # Offset just past the last complete line
+    offset = 0
+    with open(file_path, "rb+") as file:
+        while True:
+            block = file.read(1 << 20)
+            if not(block):
+                break
+            records += block.count(b"\n")
+            last_newline = block.rfind(b"\n")
+            if last_newline != -1:
+                end = offset + last_newline + 1
+            offset += len(block)
+        file.truncate(end)
+
+    return records - 1  # The header isn't a board
+
+
+class TextWriter():
+    """
+    Appends board lines to a text board file, creating it (with the given seed, or a
+    random one, and number of removed Tiles) or resuming an existing one. A partly written
+    last line is cut off, so count is always the number of complete boards.
+    """
+    def __init__(self, file_path: str, size: int, seed=None, num_to_remove=0):
+        self.file_path = file_path
+        self.size = size
+        self.num_to_remove = num_to_remove
+
+        header = readHeader(file_path)
+        if header != None:
+            if header["size"] != size or header["remove"] != num_to_remove or (seed != None and header["seed"] != seed):
+                raise Exception(f"{file_path} holds a different batch!")
+            self.seed = header["seed"]
+            self.count = countRecords(file_path)
+            self.file = open(file_path, "a")
+        else:
+            self.seed = seed if seed != None else Random().getrandbits(32)
+            self.count = 0
+            self.file = open(file_path, "w")
+            self.file.write(formatHeader(size, self.seed, num_to_remove))
+
+
+    def write(self, board_seed: int, puzzle, grid: List[List[int]]):
+        """
+        Appends one board line (with the puzzle, if there is one).
+        """
+        fields = [str(board_seed)]
+        if puzzle != None:
+            fields.append(formatGrid(puzzle))
+        fields.append(formatGrid(grid))
+        self.file.write("\t".join(fields) + "\n")
+        self.count += 1
+
+
+    def flush(self):
+        """
+        Pushes everything written so far to disk.
+        """
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+
+    def close(self):
+        self.flush()
+        self.file.close()
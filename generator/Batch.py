@@ -0,0 +1,130 @@
+from generator.Generator import Generator, defaultOptions
+from model.Model import Model
+from collections import deque
+from random import Random
+from typing import List
+import os
+
+
+def boardSeed(seed: int, index: int):
+    """
+    Returns the seed of the index-th board of a batch (independent of how
+    the batch is split between runs or workers).
+    """
+    return Random(f"{seed}/{index}").getrandbits(64)
+
+
+def generateRecords(size: int, seeds: List[int], num_to_remove=0, options=None):
+    """
+    Generates one board per seed in a worker process and, if num_to_remove
+    is given, carves a uniquely solvable puzzle out of it with the same seed.
+    options override the Generator's defaultOptions() for the size.
+    Returns a list of (seed, puzzle, grid) tuples (puzzle is None without carving).
+    """
+    options = { **defaultOptions(size), **(options or {}) }
+
+    records = []
+    for seed in seeds:
+        grid = Generator(size, seed, **options).generate()
+        puzzle = None
+        if num_to_remove > 0:
+            puzzle = [ column[:] for column in grid ]
+            for x, y in Model(Random(seed)).produceGamifyCoords(num_to_remove, grid):
+                puzzle[x][y] = None
+        records.append((seed, puzzle, grid))
+    return records
+
+
+def generateOrdered(size: int, seeds, workers=None, chunk_size=16, num_to_remove=0, options=None):
+    """
+    Generates one record (see generateRecords) per seed across a pool of worker
+    processes and yields them in the order of seeds, so a stream written to
+    disk always holds a complete prefix of the batch.
+
+    Only workers * 2 chunks are in flight at a time; seeds may be any iterable.
+    """
+    if workers == None:
+        workers = os.cpu_count() or 1
+
+    seeds = iter(seeds)
+
+    def nextChunk():
+        return [ seed for i, seed in zip(range(chunk_size), seeds) ]
+
+    # A single worker doesn't need a pool
+    if workers == 1:
+        while True:
+            chunk = nextChunk()
+            if len(chunk) == 0:
+                return
+            yield from generateRecords(size, chunk, num_to_remove, options)
+
+    # Imported here so the worker processes, which import this module, don't load it
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        while True:
+            # Keep every worker busy with one chunk and one more queued
+            while len(pending) < workers * 2:
+                chunk = nextChunk()
+                if len(chunk) == 0:
+                    break
+                pending.append(pool.submit(generateRecords, size, chunk, num_to_remove, options))
+
+            if len(pending) == 0:
+                return
+            yield from pending.popleft().result()
+
+
+def generateMany(size: int, count: int, workers=None, seed=None, chunk_size=None, options=None):
+    """
+    Generates count boards of the given size across a pool of worker processes.
+
+    The index-th board's seed is boardSeed(seed, index), the same seed the
+    command line gives it, so a batch can be reproduced board by board
+    (a random seed is chosen if None). Boards are yielded as (board_seed, grid)
+    tuples in the order they finish, so one slow board doesn't hold back the
+    rest (use generateOrdered() when the order matters), and only a few
+    chunks are in flight at a time so memory stays bounded for large counts.
+    """
+    if workers == None:
+        workers = os.cpu_count() or 1
+    if seed == None:
+        seed = Random().getrandbits(64)
+
+    # Split the work into chunks so each task is worth sending to a process
+    if chunk_size == None:
+        chunk_size = max(1, min(64, count // (workers * 4)))
+
+    indices = iter(range(count))
+
+    def nextChunk():
+        return [ boardSeed(seed, index) for i, index in zip(range(chunk_size), indices) ]
+
+    # A single worker doesn't need a pool
+    if workers == 1:
+        while True:
+            chunk = nextChunk()
+            if len(chunk) == 0:
+                return
+            for board_seed, puzzle, grid in generateRecords(size, chunk, options=options):
+                yield (board_seed, grid)
+
+    # Imported here so the worker processes, which import this module, don't load it
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while True:
+            # Keep every worker busy with one chunk and one more queued
+            while len(pending) < workers * 2:
+                chunk = nextChunk()
+                if len(chunk) == 0:
+                    break
+                pending.add(pool.submit(generateRecords, size, chunk, 0, options))
+
+            if len(pending) == 0:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for board_seed, puzzle, grid in future.result():
+                    yield (board_seed, grid)
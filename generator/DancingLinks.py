@@ -0,0 +1,412 @@
+from tile.Tile import Tile # Used without a frame or label; no tkinter needed
+from tile.Entropy import fullEntropy
+from metrics.Metrics import Metrics
+from math import isqrt      # For the square root function
+from random import Random
+from typing import List
+
+
+class DancingLinks():
+    """
+    Knuth's Dancing Links (Algorithm X) over the Sudoku exact cover matrix.
+
+    There is one matrix row per (x, y, value) choice and one column per
+    constraint: every cell holds one value, and every column, row, and
+    subsquare holds each value once. The links are kept in flat lists
+    (left, right, up, down, column) instead of node objects.
+
+    Headers and rows are linked in a shuffled order, so the search visits
+    columns and rows differently for every Random it is given.
+    """
+    def __init__(self, size: int, rng: Random):
+        self.size = size
+        subsquare_size = isqrt(size)
+        cells = size * size
+        column_count = 4 * cells
+
+        # Nodes 0 to column_count-1 are the column headers; the next node is the root
+        self.root = column_count
+        self.left = []
+        self.right = []
+        self.up = list(range(column_count + 1))
+        self.down = list(range(column_count + 1))
+        self.column = list(range(column_count + 1))
+        self.row_of = [-1] * (column_count + 1)    # The matrix row each node belongs to
+        self.count = [0] * column_count             # Number of nodes left in each column
+
+        # Link the headers into a circular list in a random order
+        header_order = list(range(column_count))
+        rng.shuffle(header_order)
+        self.left = [0] * (column_count + 1)
+        self.right = [0] * (column_count + 1)
+        previous = self.root
+        for header in header_order:
+            self.right[previous] = header
+            self.left[header] = previous
+            previous = header
+        self.right[previous] = self.root
+        self.left[self.root] = previous
+
+        # Add the rows in a random order, so each column lists its rows randomly
+        row_order = list(range(cells * size))
+        rng.shuffle(row_order)
+        for row in row_order:
+            cell, value_index = divmod(row, size)
+            x, y = divmod(cell, size)
+            subsquare = (x // subsquare_size) * subsquare_size + (y // subsquare_size)
+            self.addRow(row, [ cell,
+                               cells + x * size + value_index,
+                               2 * cells + y * size + value_index,
+                               3 * cells + subsquare * size + value_index ])
+
+        # The first node of every matrix row, for selecting givens
+        self.row_start = {}
+        for node in range(column_count + 1, len(self.row_of), 4):
+            self.row_start[self.row_of[node]] = node
+
+
+    def addRow(self, row: int, columns: List[int]):
+        """
+        Appends one matrix row with a node in each of the given columns.
+        """
+        first = len(self.row_of)
+        for i, column in enumerate(columns):
+            node = first + i
+            self.left.append(first + (i - 1) % len(columns))
+            self.right.append(first + (i + 1) % len(columns))
+
+            # Insert at the bottom of the column
+            self.up.append(self.up[column])
+            self.down.append(column)
+            self.down[self.up[column]] = node
+            self.up[column] = node
+
+            self.column.append(column)
+            self.row_of.append(row)
+            self.count[column] += 1
+
+
+    def cover(self, column: int):
+        """
+        Removes the column from the header list and every row that uses it from the other columns.
+        """
+        left, right, up, down, column_of, count = self.left, self.right, self.up, self.down, self.column, self.count
+        right[left[column]] = right[column]
+        left[right[column]] = left[column]
+
+        i = down[column]
+        while i != column:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                count[column_of[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+
+    def uncover(self, column: int):
+        """
+        Exactly reverses cover() for the same column.
+        """
+        left, right, up, down, column_of, count = self.left, self.right, self.up, self.down, self.column, self.count
+        i = up[column]
+        while i != column:
+            j = left[i]
+            while j != i:
+                count[column_of[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+
+        right[left[column]] = column
+        left[right[column]] = column
+
+
+    def selectRow(self, node: int):
+        """
+        Covers every other column the node's row uses.
+        """
+        j = self.right[node]
+        while j != node:
+            self.cover(self.column[j])
+            j = self.right[j]
+
+
+    def unselectRow(self, node: int):
+        """
+        Exactly reverses selectRow() for the same node.
+        """
+        j = self.left[node]
+        while j != node:
+            self.uncover(self.column[j])
+            j = self.left[j]
+
+
+    def chooseColumn(self):
+        """
+        Returns the uncovered column with the fewest rows left.
+        """
+        right, count = self.right, self.count
+        best_column = right[self.root]
+        best_count = count[best_column]
+        column = right[best_column]
+        while column != self.root and best_count > 1:
+            if count[column] < best_count:
+                best_column = column
+                best_count = count[column]
+            column = right[column]
+        return best_column
+
+
+    def placeGivens(self, rows: List[int]):
+        """
+        Selects the given matrix rows before searching (the filled cells of a puzzle).
+        Returns False if two of them conflict.
+        """
+        for row in rows:
+            node = self.row_start[row]
+
+            # Every column of the row must still be uncovered
+            j = node
+            while True:
+                column = self.column[j]
+                if self.right[self.left[column]] != column:
+                    return False
+                j = self.right[j]
+                if j == node:
+                    break
+
+            self.cover(self.column[node])
+            self.selectRow(node)
+        return True
+
+
+    def search(self):
+        """
+        Runs Algorithm X without recursion.
+
+        Yields ('place', row) and ('remove', row) as rows are chosen and undone,
+        and ('solution', rows) each time every column is covered; resuming after
+        a solution keeps searching for the next one.
+        """
+        chosen = []     # Chosen nodes, one per level
+        root = self.root
+
+        while True:
+            if self.right[root] == root:
+                yield ('solution', [ self.row_of[node] for node in chosen ])
+                column = None
+            else:
+                column = self.chooseColumn()
+                self.cover(column)
+                node = self.down[column]
+
+            # Try the next row in the column, backing up a level whenever a column runs out
+            while True:
+                if column != None and node != column:
+                    self.selectRow(node)
+                    chosen.append(node)
+                    yield ('place', self.row_of[node])
+                    break
+
+                if column != None:
+                    self.uncover(column)
+                if len(chosen) == 0:
+                    return
+
+                node = chosen.pop()
+                self.unselectRow(node)
+                yield ('remove', self.row_of[node])
+                column = self.column[node]
+                node = self.down[node]
+
+
+class DancingLinksGenerator():
+    """
+    An exact cover backend that can stand in for the wave collapse Generator
+    wherever boards are consumed: it has steps(), generate(), getGrid(),
+    reseed(), seed, tile_grid, history, and metrics (with the restarts,
+    nodes, and backtracks shortcuts). Only decisions, nodes, backtracks,
+    max_depth, and max_backtrack_run are counted; the Generator's options
+    (restarts, budgets, propagation rules, tracing) don't apply to exact
+    cover, so none are accepted.
+
+    It can also complete a partially filled grid with solve() and count its
+    solutions with countSolutions().
+    """
+    def __init__(self, size: int, seed=None, **options):
+        # Verify that the size is valid
+        if size not in [4, 9, 16, 25, 36, 49]:
+            raise Exception("Invalid Board Size!")
+        if options:
+            raise Exception(f"Unsupported Dancing Links Options: {', '.join(options)}!")
+
+        self.size = size
+        self.reseed(seed)
+        self.history = []   # Dancing Links keeps its own search stack
+
+        # Counters for the last search (exact cover never restarts)
+        self.metrics = Metrics()
+
+        subsquare_size = isqrt(size)
+        self.tile_grid = [ [ Tile(None, None, (x // subsquare_size, y // subsquare_size), size, x, y)
+                             for y in range(size) ] for x in range(size) ]
+
+
+    @property
+    def restarts(self):
+        """Always 0; exact cover never restarts."""
+        return self.metrics.restarts
+
+
+    @property
+    def nodes(self):
+        """Number of rows placed by the last search."""
+        return self.metrics.nodes
+
+
+    @property
+    def backtracks(self):
+        """Number of placed rows the last search undid."""
+        return self.metrics.backtracks
+
+
+    def reseed(self, seed=None):
+        """
+        Makes every following search from a Random seeded with seed
+        (a random seed if None), kept in self.seed.
+        """
+        if seed == None:
+            seed = Random().getrandbits(32)
+        self.seed = seed
+        self.random = Random(seed)
+
+
+    def decodeRow(self, row: int):
+        """
+        Returns the (x, y, value) choice a matrix row stands for.
+        """
+        cell, value_index = divmod(row, self.size)
+        x, y = divmod(cell, self.size)
+        return (x, y, value_index + 1)
+
+
+    def givenRows(self, grid: List[List[int]]):
+        """
+        Returns the matrix rows for the filled cells of grid[x][y] (None or 0 means empty).
+        """
+        rows = []
+        for x in range(self.size):
+            for y in range(self.size):
+                if grid[x][y]:
+                    rows.append((x * self.size + y) * self.size + grid[x][y] - 1)
+        return rows
+
+
+    def steps(self, grid=None):
+        """
+        Generates a board (or completes grid) one change at a time, yielding
+        (x, y, value) when a Tile is filled and (x, y, None) when it is cleared.
+        """
+        metrics = self.metrics
+        metrics.reset()
+
+        full_entropy = fullEntropy(self.size)
+        for column in self.tile_grid:
+            for tile in column:
+                tile.value = None
+                tile.collapsed = False
+                tile.entropy = full_entropy
+
+        links = DancingLinks(self.size, self.random)
+        rows = self.givenRows(grid) if grid != None else []
+        if not(links.placeGivens(rows)):
+            raise Exception("The grid breaks the rules of Sudoku!")
+
+        for row in rows:
+            yield self.setTile(*self.decodeRow(row))
+
+        depth = 0
+        backtrack_run = 0   # Rows undone since the search last placed one
+        for event, row in links.search():
+            if event == 'solution':
+                return
+
+            if event == 'place':
+                metrics.decisions += 1
+                metrics.nodes += 1
+                depth += 1
+                backtrack_run = 0
+                if depth > metrics.max_depth:
+                    metrics.max_depth = depth
+            else:
+                metrics.backtracks += 1
+                depth -= 1
+                backtrack_run += 1
+                if backtrack_run > metrics.max_backtrack_run:
+                    metrics.max_backtrack_run = backtrack_run
+
+            x, y, value = self.decodeRow(row)
+            yield self.setTile(x, y, value if event == 'place' else None)
+
+        raise Exception("The grid has no solution!")
+
+
+    def setTile(self, x: int, y: int, value: int):
+        """
+        Mirrors a change on the data-only Tile and returns it as an (x, y, value) tuple.
+        """
+        tile = self.tile_grid[x][y]
+        tile.value = value
+        tile.collapsed = value != None
+        tile.entropy = 0 if value != None else fullEntropy(self.size)
+        return (x, y, value)
+
+
+    def generate(self):
+        """
+        Generates a complete board.
+        Returns the solved grid of values, indexed as grid[x][y].
+        """
+        for change in self.steps():
+            pass
+
+        return self.getGrid()
+
+
+    def solve(self, grid: List[List[int]]):
+        """
+        Completes a partially filled grid[x][y] (None or 0 means empty).
+        Returns the solved grid; raises an Exception if there is no solution.
+        """
+        for change in self.steps(grid):
+            pass
+
+        return self.getGrid()
+
+
+    def countSolutions(self, grid: List[List[int]], limit=2):
+        """
+        Counts the solutions of a partially filled grid, stopping once limit are found.
+        """
+        links = DancingLinks(self.size, self.random)
+        if not(links.placeGivens(self.givenRows(grid))):
+            return 0
+
+        solutions = 0
+        for event, row in links.search():
+            if event == 'solution':
+                solutions += 1
+                if solutions >= limit:
+                    break
+        return solutions
+
+
+    def getGrid(self):
+        """
+        Returns the current values of the grid, indexed as grid[x][y].
+        Unfilled Tiles hold None.
+        """
+        return [ [ tile.value for tile in column ] for column in self.tile_grid ]
@@ -0,0 +1,607 @@
+from model.Model import Model
+from model.EntropyBuckets import EntropyBuckets
+from snapshot.Snapshot import Snapshot
+from tile.Tile import Tile # Used without a frame or label; no tkinter needed
+from tile.Peers import getPeerTable
+from tile.Entropy import fullEntropy, valueBit
+from generator.Restarts import makeSchedule
+from metrics.Metrics import Metrics
+from tracing.Trace import DECIDE, FORCE, UNFORCE, REJECT, CONFLICT, BACKTRACK, RESTART, PROPAGATE
+from math import isqrt      # For the square root function
+import time                 # For the time budget
+from random import Random
+from typing import List
+
+
+def defaultOptions(size: int):
+    """
+    Returns the Generator options every caller uses for a board of the
+    given size: boards of 25x25 and up need singles propagation to finish
+    in reasonable time.
+    """
+    large_board = size >= 25
+    return { "naked_singles": large_board, "hidden_singles": large_board }
+
+
+class Generator():
+    """
+    A headless wave collapse engine for Sudoku boards.
+
+    The Generator owns a grid of data-only Tiles and does all of the
+    collapsing, propagating and backtracking itself, so it can be used
+    without tkinter or PIL (on a server, in a test, or under a timer).
+    The View only consumes the changes it reports.
+
+    Large boards can get stuck behind one unlucky early decision, so a run
+    can be abandoned and restarted from scratch on a schedule of backtrack
+    limits (restart_policy 'luby' or 'geometric', in units of restart_base
+    backtracks). node_budget and time_budget (seconds) cap the total work
+    across every restart.
+
+    value_order chooses how a Tile's value is picked: 'random' (uniform)
+    or 'least_constraining' (the value the fewest peers still allow).
+
+    Propagation only removes a collapsed value from its peers unless extra
+    rules are switched on; they then run to a fixpoint after every collapse
+    and undo the collapse as soon as they find a contradiction:
+    - naked_singles: a Tile with one value left is collapsed to it
+    - hidden_singles: a value with one place left in a unit is collapsed there
+    - naked_pairs: two Tiles in a unit sharing the same two values remove
+      them from the rest of the unit
+
+    trace takes a TraceRecorder (see tracing/Trace.py) that records every
+    decision, propagation, and backtrack of each generation.
+
+    self.metrics counts what the last generation did (see metrics/Metrics.py);
+    metrics_callback, if given, is called with it every metrics_every nodes.
+    """
+    def __init__(self, size: int, seed=None, restart_policy="luby", restart_base=100,
+                 node_budget=None, time_budget=None, value_order="random",
+                 naked_singles=False, hidden_singles=False, naked_pairs=False, trace=None,
+                 metrics_callback=None, metrics_every=1000):
+        # Verify that the size is valid
+        if size not in [4, 9, 16, 25, 36, 49]:
+            raise Exception("Invalid Board Size!")
+
+        self.size = size
+        self.reseed(seed)
+
+        if value_order not in ["random", "least_constraining"]:
+            raise Exception("Invalid Value Order!")
+        self.value_order = value_order
+
+        # Propagation rules run to a fixpoint after each collapse
+        self.naked_singles = naked_singles
+        self.hidden_singles = hidden_singles
+        self.naked_pairs = naked_pairs
+        self.use_rules = naked_singles or hidden_singles or naked_pairs
+
+        # Optional recorder of the search's events
+        self.trace = trace
+
+        # Restart strategy and budgets, plus counters for the last generation
+        self.restart_policy = restart_policy
+        self.restart_base = restart_base
+        self.node_budget = node_budget
+        self.time_budget = time_budget
+
+        # Counters and phase timers for the last generation
+        self.metrics = Metrics()
+        self.metrics_callback = metrics_callback
+        self.metrics_every = metrics_every
+
+        # Keep track of the history for backtracking (a stack of Snapshot objects)
+        self.history = []
+
+        # Undo log of (Tile, entropy before the change) entries written by propagation;
+        # (Tile, None) records a Tile that propagation collapsed
+        self.trail = []
+
+        # Changes made by propagation or its undoing that haven't been yielded yet
+        self.changes = []
+
+        # The uncollapsed Tiles grouped by entropy count, for choosing the next Tile
+        self.buckets = EntropyBuckets(size)
+
+        self.tile_grid = self.populateGrid()
+
+        # Resolve the shared peer table into Tile references once
+        table = getPeerTable(size)
+        self.peers = [ [ [ self.tile_grid[px][py] for px, py in table.peers[x][y] ]
+                         for y in range(size) ] for x in range(size) ]
+        self.units = [ [ self.tile_grid[ux][uy] for ux, uy in unit ] for unit in table.units ]
+        self.tile_units = table.cell_units
+
+
+    def reseed(self, seed=None):
+        """
+        Makes every following choice from a Random seeded with seed (a random
+        seed if None). The seed is kept in self.seed, so any board can be
+        generated again, along the same search path, by a Generator with the
+        same size, options, and seed.
+        """
+        if seed == None:
+            seed = Random().getrandbits(32)
+        self.seed = seed
+        self.model = Model(Random(seed))
+
+
+    @property
+    def restarts(self):
+        """Number of times the last generation started over."""
+        return self.metrics.restarts
+
+
+    @property
+    def nodes(self):
+        """Number of value choices made (including failed ones)."""
+        return self.metrics.nodes
+
+
+    @property
+    def backtracks(self):
+        """Number of times a decision was undone."""
+        return self.metrics.backtracks
+
+
+    def populateGrid(self):
+        """
+        Creates all of the data-only Tile objects in the grid with max entropy.
+        Returns the tile grid list, indexed as tile_grid[x][y].
+        """
+        subsquare_size = isqrt(self.size)
+        tile_grid = []
+
+        for column in range(self.size):
+            temp = []
+            for row in range(self.size):
+                subsquare_coord = (column // subsquare_size, row // subsquare_size)
+                temp.append(Tile(None, None, subsquare_coord, self.size, column, row))
+            tile_grid.append(temp)
+
+        return tile_grid
+
+
+    def reset(self):
+        """
+        Returns every Tile in the grid to its empty, max entropy state.
+        """
+        self.history = []
+        self.trail = []
+        self.changes = []
+        self.buckets.clear()
+        full_entropy = fullEntropy(self.size)
+        for x in range(self.size):
+            for y in range(self.size):
+                tile = self.tile_grid[x][y]
+                tile.value = None
+                tile.entropy = full_entropy
+                tile.collapsed = False
+                self.buckets.add(tile, self.size)
+
+
+    def placeValue(self, tile: Tile, value: int):
+        """
+        Collapses the Tile to the given value.
+        """
+        self.buckets.remove(tile)
+        tile.collapsed = True
+        tile.value = value
+
+
+    def clearValue(self, tile: Tile):
+        """
+        Un-collapses the Tile so it can be chosen again.
+        """
+        tile.collapsed = False
+        tile.value = None
+        self.buckets.add(tile, tile.entropy.bit_count())
+
+
+    def generate(self):
+        """
+        Runs the wave collapse function to completion.
+        Returns the solved grid of values, indexed as grid[x][y].
+        """
+        for change in self.steps():
+            pass
+
+        return self.getGrid()
+
+
+    def getGrid(self):
+        """
+        Returns the current values of the grid, indexed as grid[x][y].
+        Uncollapsed Tiles hold None.
+        """
+        return [ [ tile.value for tile in column ] for column in self.tile_grid ]
+
+
+    def steps(self):
+        """
+        Generates a board one change at a time.
+
+        Yields an (x, y, value) tuple each time a Tile is collapsed,
+        and (x, y, None) each time a Tile is cleared while backtracking
+        or restarting. Consumers (such as the View) can draw, animate,
+        or pause between changes.
+
+        Raises TimeoutError if the node or time budget runs out first.
+        """
+        self.metrics.reset()
+        self.start_time = time.perf_counter()
+        schedule = makeSchedule(self.restart_policy, self.restart_base)
+        if self.trace != None:
+            self.trace.begin(self.size)
+
+        try:
+            while True:
+                backtrack_limit = next(schedule) if schedule != None else None
+                if (yield from self.runSteps(backtrack_limit)):
+                    return
+
+                # The run backtracked too much; clear the board and start over
+                for column in self.tile_grid:
+                    for tile in column:
+                        if tile.collapsed:
+                            yield (tile.coord[0], tile.coord[1], None)
+                self.metrics.restarts += 1
+                if self.trace != None:
+                    self.trace.record(RESTART, extra=self.restarts)
+        finally:
+            # Finish a trace file even if the budget ran out
+            if self.trace != None:
+                self.trace.close()
+
+
+    def checkTimeBudget(self):
+        """
+        Raises TimeoutError once the time budget has been used up.
+        """
+        if self.time_budget != None and time.perf_counter() - self.start_time > self.time_budget:
+            raise TimeoutError("Time budget exceeded!")
+
+
+    def runSteps(self, backtrack_limit=None):
+        """
+        Makes one attempt at generating a board from empty, yielding each change.
+        Returns True when the board is filled, or False once the run has
+        backtracked more than backtrack_limit times (None means no limit).
+        """
+        start = True # To make the first collapsed Tile be in the center
+        backtracking = False # To keep track if we choose the Tile to collapse or not
+        run_backtracks = 0
+        backtrack_run = 0 # Decisions undone since the search last made progress
+        metrics = self.metrics
+        clock = time.perf_counter
+
+        # Start by clearing the board
+        self.reset()
+
+        # Continue this loop until every tile has collapsed
+        while True:
+            select_start = clock()
+
+            """
+            Choosing the tile based on if this is the first time running the method,
+            if we are actively backtracking, or if we are proceeding normally.
+            """
+            if start: # Start with collapsing the Tile in the center
+                chosen_tile = self.tile_grid[self.size // 2][self.size // 2]
+                start = False
+
+            elif backtracking:
+                chosen_tile = last_snapshot.collapsed_tile
+
+            else: # Get a random uncollapsed Tile with the lowest entropy
+                valid_tiles = self.buckets.lowest()
+                if valid_tiles == None:
+                    return True   # No more uncollapsed Tiles, so the board is filled and the run can end
+                chosen_tile = self.model.chooseRandomTile(valid_tiles)
+
+            """
+            Choosing the value to assign to the Tile based on if we are backtracking
+            or if we are proceeding normally.
+            """
+            exclude = last_snapshot.collapsed_values if backtracking else []
+            if self.value_order == "random":
+                chosen_value = self.model.chooseRandomValue(chosen_tile, exclude)
+            else:
+                peers = self.peers[chosen_tile.coord[0]][chosen_tile.coord[1]]
+                chosen_value = self.model.chooseLeastConstrainingValue(chosen_tile, exclude, peers)
+
+            x, y = chosen_tile.coord
+            metrics.select_time += clock() - select_start
+
+            metrics.nodes += 1
+            if self.node_budget != None and metrics.nodes > self.node_budget:
+                raise TimeoutError("Node budget exceeded!")
+            if metrics.nodes & 255 == 0: # Reading the clock costs more than a node, so only check it now and then
+                self.checkTimeBudget()
+            if self.metrics_callback != None and metrics.nodes % self.metrics_every == 0:
+                self.metrics_callback(metrics)
+
+            if chosen_value == None: # After exclusions, no entropy can be chosen; time to backtrack.
+                metrics.backtracks += 1
+                run_backtracks += 1
+                backtrack_run += 1
+                if backtrack_run > metrics.max_backtrack_run:
+                    metrics.max_backtrack_run = backtrack_run
+                if backtrack_limit != None and run_backtracks > backtrack_limit:
+                    return False
+
+                # Extract the last snapshot
+                last_snapshot = self.history.pop(-1)
+                backtrack_tile = last_snapshot.collapsed_tile
+                if self.trace != None:
+                    self.trace.record(BACKTRACK, backtrack_tile.coord[0], backtrack_tile.coord[1], extra=len(self.history))
+
+                # Undo the propagation recorded since the last snapshot, then reset its Tile
+                undo_start = clock()
+                self.reverseEntropy(last_snapshot.trail_mark)
+                metrics.undo_time += clock() - undo_start
+                yield from self.flushChanges()
+                self.clearValue(backtrack_tile)
+                yield (backtrack_tile.coord[0], backtrack_tile.coord[1], None)
+
+                backtracking = True
+                continue
+
+            # Mark the Tile as collapsed and assign the value to it
+            self.placeValue(chosen_tile, chosen_value)
+            metrics.decisions += 1
+            if self.trace != None:
+                self.trace.record(DECIDE, x, y, chosen_value, len(self.history))
+            yield (x, y, chosen_value)
+
+            # Add the new change to history
+            if backtracking:
+                last_snapshot.collapsed_values.append(chosen_value)
+                last_snapshot.trail_mark = len(self.trail)
+                self.history.append(last_snapshot)
+            else:
+                self.history.append(Snapshot(chosen_tile, chosen_value, len(self.trail)))
+
+            backtracking = False
+            if len(self.history) > metrics.max_depth:
+                metrics.max_depth = len(self.history)
+
+            # Backtrack if a tile will have zero entropy after propagation
+            propagate_start = clock()
+            if self.searchZeroEntropyPropagation(chosen_tile, chosen_value) == 1:
+                metrics.propagate_time += clock() - propagate_start
+                metrics.zero_entropy += 1
+
+                # Acquire the latest snapshot for backtracking
+                last_snapshot = self.history.pop(-1)
+
+                # Reset the Tile that needs to be changed
+                self.clearValue(chosen_tile)
+                if self.trace != None:
+                    self.trace.record(REJECT, x, y, chosen_value)
+                yield (x, y, None)
+
+                # Start the cycle again with new exclusions for the values
+                backtracking = True
+                continue
+
+            # Propagate the entropy of affected Tiles
+            trail_mark = len(self.trail)
+            self.propagateEntropy(chosen_tile, chosen_value)
+
+            # Run the extra rules; on a contradiction, undo this collapse like a zero entropy Tile
+            if self.use_rules and not(self.propagateRules(trail_mark)):
+                undo_start = clock()
+                metrics.propagate_time += undo_start - propagate_start
+                metrics.contradictions += 1
+
+                last_snapshot = self.history.pop(-1)
+                self.reverseEntropy(last_snapshot.trail_mark)
+                metrics.undo_time += clock() - undo_start
+                yield from self.flushChanges()
+
+                self.clearValue(chosen_tile)
+                if self.trace != None:
+                    self.trace.record(CONFLICT, x, y, chosen_value)
+                yield (x, y, None)
+
+                backtracking = True
+                continue
+
+            metrics.propagate_time += clock() - propagate_start
+            backtrack_run = 0
+
+            if self.trace != None:
+                self.trace.record(PROPAGATE, x, y, chosen_value, len(self.trail) - trail_mark)
+            yield from self.flushChanges()
+
+
+    def flushChanges(self):
+        """
+        Yields, oldest first, the changes propagation made to Tiles other
+        than the one chosen, and forgets them.
+        """
+        changes = self.changes
+        self.changes = []
+        yield from changes
+
+
+    def reverseEntropy(self, trail_mark: int):
+        """
+        Restores the entropy of every Tile changed since the trail had
+        length trail_mark, newest change first. For going back in time
+        for backtracking; costs one step per recorded change.
+        """
+        trail = self.trail
+        while len(trail) > trail_mark:
+            curr_tile, old_entropy = trail.pop()
+            if old_entropy == None: # The Tile was collapsed by propagation
+                self.clearValue(curr_tile)
+                self.changes.append((curr_tile.coord[0], curr_tile.coord[1], None))
+                if self.trace != None:
+                    self.trace.record(UNFORCE, curr_tile.coord[0], curr_tile.coord[1])
+                continue
+            curr_tile.entropy = old_entropy
+            if curr_tile.collapsed == False:
+                self.buckets.update(curr_tile, old_entropy.bit_count())
+
+
+    def searchZeroEntropyPropagation(self, tile: Tile, propagation_value: int):
+        """
+        Given a Tile soon to be collapsed and a value to ignore, searches the Tile's
+        peers to see if any will have zero entropy. If so, return 1, else return 0.
+        """
+        value_bit = valueBit(propagation_value)
+
+        for curr_tile in self.peers[tile.coord[0]][tile.coord[1]]:
+            if curr_tile.collapsed == False:
+                if curr_tile.entropy == 0:
+                    raise Exception("0 Entropy.") # We should be catching at length 1
+                elif curr_tile.entropy == value_bit: # The value is the only one left
+                    return 1
+        return 0
+
+
+    def propagateEntropy(self, tile: Tile, value: int):
+        """
+        Will change the entropy of the given Tile and its peers based on
+        the given value, recording every change on the trail.
+        """
+        clear_mask = ~valueBit(value)
+        trail = self.trail
+        removals = 0
+
+        for curr_tile in [tile] + self.peers[tile.coord[0]][tile.coord[1]]:
+            new_entropy = curr_tile.entropy & clear_mask
+            if new_entropy != curr_tile.entropy:
+                trail.append((curr_tile, curr_tile.entropy))
+                curr_tile.entropy = new_entropy
+                if curr_tile.collapsed == False:
+                    self.buckets.update(curr_tile, new_entropy.bit_count())
+                    removals += 1
+
+        self.metrics.propagations += 1
+        self.metrics.domain_removals += removals
+
+
+    def narrowEntropy(self, tile: Tile, new_entropy: int):
+        """
+        Replaces an uncollapsed Tile's entropy with a smaller one, recording the change on the trail.
+        """
+        self.trail.append((tile, tile.entropy))
+        self.metrics.domain_removals += (tile.entropy & ~new_entropy).bit_count()
+        tile.entropy = new_entropy
+        self.buckets.update(tile, new_entropy.bit_count())
+
+
+    def forceValue(self, tile: Tile, value: int):
+        """
+        Collapses a Tile that the propagation rules proved must hold the value,
+        recording it on the trail so backtracking can undo it.
+        """
+        self.trail.append((tile, None))
+        self.metrics.forced += 1
+        self.placeValue(tile, value)
+        self.changes.append((tile.coord[0], tile.coord[1], value))
+        if self.trace != None:
+            self.trace.record(FORCE, tile.coord[0], tile.coord[1], value)
+        self.propagateEntropy(tile, value)
+
+
+    def propagateRules(self, trail_mark: int):
+        """
+        Applies the enabled rules to every Tile changed since the trail had
+        length trail_mark, and to the Tiles their changes lead to, until
+        nothing else changes.
+
+        Returns False as soon as a contradiction is found (an uncollapsed
+        Tile without entropy, or a value with no place left in a unit), else True.
+        """
+        trail = self.trail
+        cursor = trail_mark
+        dirty_units = set()
+        check_units = self.hidden_singles or self.naked_pairs
+
+        while True:
+            # Look at every Tile whose entropy changed
+            while cursor < len(trail):
+                curr_tile, old_entropy = trail[cursor]
+                cursor += 1
+                if curr_tile.collapsed:
+                    continue
+
+                entropy = curr_tile.entropy
+                if entropy == 0:
+                    return False
+                if self.naked_singles and entropy & (entropy - 1) == 0:
+                    self.forceValue(curr_tile, entropy.bit_length())
+                    continue
+                if check_units:
+                    dirty_units.update(self.tile_units[curr_tile.coord[0]][curr_tile.coord[1]])
+
+            if len(dirty_units) == 0:
+                return True
+
+            # Then at the units they belong to
+            unit = self.units[dirty_units.pop()]
+            if self.hidden_singles and not(self.searchHiddenSingles(unit)):
+                return False
+            if self.naked_pairs:
+                self.searchNakedPairs(unit)
+
+
+    def searchHiddenSingles(self, unit: List[Tile]):
+        """
+        Collapses every value in the unit that only one uncollapsed Tile still allows.
+        Returns False if some value can no longer go anywhere in the unit, else True.
+        """
+        placed = 0
+        seen_once = 0
+        seen_twice = 0
+        for curr_tile in unit:
+            if curr_tile.collapsed:
+                placed |= valueBit(curr_tile.value)
+            else:
+                seen_twice |= seen_once & curr_tile.entropy
+                seen_once |= curr_tile.entropy
+
+        if fullEntropy(self.size) & ~(placed | seen_once):
+            return False
+
+        hidden = seen_once & ~seen_twice & ~placed
+        while hidden:
+            value_bit = hidden & -hidden
+            hidden ^= value_bit
+
+            # An earlier single in this loop may have taken the only Tile left for this value
+            for curr_tile in unit:
+                if not(curr_tile.collapsed) and curr_tile.entropy & value_bit:
+                    self.forceValue(curr_tile, value_bit.bit_length())
+                    break
+            else:
+                return False
+
+        return True
+
+
+    def searchNakedPairs(self, unit: List[Tile]):
+        """
+        For every two uncollapsed Tiles in the unit left with the same two values,
+        removes those values from the rest of the unit.
+        """
+        pair_tiles = {}
+        for curr_tile in unit:
+            if not(curr_tile.collapsed) and curr_tile.entropy.bit_count() == 2:
+                if curr_tile.entropy not in pair_tiles:
+                    pair_tiles[curr_tile.entropy] = curr_tile
+                    continue
+
+                pair = curr_tile.entropy
+                partner = pair_tiles[pair]
+                if partner.entropy != pair: # Narrowed since it was seen
+                    continue
+                for other_tile in unit:
+                    if other_tile.collapsed or other_tile is curr_tile or other_tile is partner:
+                        continue
+                    if other_tile.entropy & pair:
+                        self.narrowEntropy(other_tile, other_tile.entropy & ~pair)
@@ -0,0 +1,72 @@
+from generator.Generator import Generator, defaultOptions
+from multiprocessing import Process, Queue
+from queue import Empty
+from random import Random
+import os
+
+
+def raceWorker(results: Queue, size: int, seed: int, value_order: str, time_budget, options: dict):
+    """
+    Runs one racer in its own process and puts (seed, value_order, grid) on the
+    results queue; grid is None if the racer ran out of time.
+    """
+    generator = Generator(size, seed, value_order=value_order, time_budget=time_budget, **options)
+    try:
+        grid = generator.generate()
+    except TimeoutError:
+        grid = None
+    results.put((seed, value_order, grid))
+
+
+def raceGenerate(size: int, racers=None, seed=None, time_budget=None, value_orders=("random", "least_constraining"),
+                 options=None):
+    """
+    Races several differently seeded Generators in separate processes and
+    returns the first board to finish as a (seed, value_order, grid) tuple.
+    The remaining racers are terminated.
+
+    Each racer gets its own seed drawn from a Random seeded with seed, and
+    the racers take turns using the value orders in value_orders. Racing K
+    copies of a heavy-tailed search turns its runtime into roughly the
+    minimum of K draws, which is what matters for one large board.
+    options override the Generator's defaultOptions() for the size.
+
+    Raises TimeoutError if every racer runs out of its time budget.
+    """
+    if racers == None:
+        racers = os.cpu_count() or 1
+
+    options = { **defaultOptions(size), **(options or {}) }
+    seed_stream = Random(seed)
+    results = Queue()
+    processes = []
+
+    for i in range(racers):
+        value_order = value_orders[i % len(value_orders)]
+        process = Process(target=raceWorker, args=(results, size, seed_stream.getrandbits(64), value_order, time_budget, options), daemon=True)
+        process.start()
+        processes.append(process)
+
+    try:
+        finished = 0
+        while finished < racers:
+            try:
+                racer_seed, value_order, grid = results.get(timeout=1)
+            except Empty:
+                # Stop waiting if every racer died without reporting back
+                if not any(process.is_alive() for process in processes) and results.empty():
+                    break
+                continue
+
+            finished += 1
+            if grid != None:
+                return (racer_seed, value_order, grid)
+    finally:
+        # The first board wins; cancel everyone else
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+
+    raise TimeoutError("Every racer exceeded its time budget!")
@@ -0,0 +1,55 @@
+"""
+Restart schedules for the Generator.
+
+Each schedule is an endless iterator of backtrack limits: the Generator
+gives up on a run (and starts over from an empty board) once that run has
+backtracked more times than the current limit, then moves on to the next one.
+"""
+
+
+def lubyTerm(i: int):
+    """
+    Returns the i-th term (starting at 1) of the Luby sequence.
+    """
+    # Find the smallest k such that i <= 2^k - 1
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+
+    if i == (1 << k) - 1:
+        return 1 << (k - 1)
+    return lubyTerm(i - (1 << (k - 1)) + 1)
+
+
+def lubySequence(base: int):
+    """
+    Yields base times the Luby sequence: 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ...
+    """
+    i = 1
+    while True:
+        yield base * lubyTerm(i)
+        i += 1
+
+
+def geometricSequence(base: int, factor=1.5):
+    """
+    Yields base, base*factor, base*factor^2, ... rounded down.
+    """
+    limit = base
+    while True:
+        yield int(limit)
+        limit *= factor
+
+
+def makeSchedule(policy: str, base: int):
+    """
+    Returns the schedule iterator for the named policy ('luby' or 'geometric'),
+    or None when policy is None (never restart).
+    """
+    if policy == None:
+        return None
+    if policy == "luby":
+        return lubySequence(base)
+    if policy == "geometric":
+        return geometricSequence(base)
+    raise Exception("Invalid Restart Policy!")
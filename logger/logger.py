@@ -1,5 +1,10 @@
 
-from threading import Lock, Thread
+from threading import Event, Lock, Thread
+from queue import Queue, Empty
+from time import monotonic
+import os
+import sys
+import weakref
 
 
 isLogger = False    # For single-thread singleton implementation
@@ -31,15 +36,123 @@ class LoggerMeta(type):
         return cls._instances[cls]
 
 
+STOP = object()     # Queued to make the writer thread finish
+
+
+def rotateFiles(file_path: str, backups: int):
+    """
+    Shifts file_path to file_path.1, file_path.1 to file_path.2, and so on,
+    dropping the oldest once there are backups of them.
+    """
+    for i in range(backups - 1, 0, -1):
+        if os.path.exists(f"{file_path}.{i}"):
+            os.replace(f"{file_path}.{i}", f"{file_path}.{i+1}")
+    if backups > 0:
+        os.replace(file_path, f"{file_path}.1")
+    else:
+        os.remove(file_path)
+
+
+def writeBatch(file_path: str, batch: str, max_bytes, backups: int):
+    """
+    Appends a batch of logs to the file, rotating it first if it would grow past max_bytes.
+    """
+    try:
+        if max_bytes != None and os.path.exists(file_path):
+            size = os.path.getsize(file_path)
+            if size > 0 and size + len(batch) > max_bytes:
+                rotateFiles(file_path, backups)
+
+        open_file = open(file_path, "a")
+        open_file.write(batch)
+        open_file.close()
+    except OSError as error:
+        # Losing a batch of logs is better than stopping the program
+        print(f"Logger could not write to {file_path}: {error}", file=sys.stderr)
+
+
+def writeLoop(queue: Queue, file_path: str, max_bytes, backups: int, batch_bytes: int, flush_interval: float):
+    """
+    Runs on the writer thread: collects queued logs and writes them in batches,
+    once batch_bytes have piled up or the oldest has waited flush_interval
+    seconds (or right away when a flush or stop is requested).
+    """
+    pending = []
+    pending_bytes = 0
+    deadline = None     # When the oldest pending log has to be written
+
+    while True:
+        # Wait for the next log, but not past the deadline
+        try:
+            if deadline == None:
+                items = [queue.get()]
+            else:
+                items = [queue.get(timeout=max(0, deadline - monotonic()))]
+        except Empty:
+            items = []
+
+        # Take everything else that is already waiting
+        while True:
+            try:
+                items.append(queue.get_nowait())
+            except Empty:
+                break
+
+        flushes = []
+        stop = False
+        for item in items:
+            if item is STOP:
+                stop = True
+            elif isinstance(item, Event):
+                flushes.append(item)
+            else:
+                if len(pending) == 0:
+                    deadline = monotonic() + flush_interval
+                pending.append(item)
+                pending_bytes += len(item)
+
+        if pending and (stop or flushes or pending_bytes >= batch_bytes or monotonic() >= deadline):
+            writeBatch(file_path, "".join(pending), max_bytes, backups)
+            pending = []
+            pending_bytes = 0
+            deadline = None
+
+        for flushed in flushes:
+            flushed.set()
+        if stop:
+            return
+
+
+def stopWriter(queue: Queue, writer: Thread):
+    """
+    Writes whatever is still queued and waits for the writer thread to finish.
+    """
+    queue.put(STOP)
+    writer.join()
+
+
 class Logger(metaclass=LoggerMeta):
 #class Logger():
     """
     This class is used to log any desired content to a given file.
+
+    Logs are handed to a background writer thread through a queue, so
+    logging never waits on the disk. The thread writes them in batches and
+    starts a new file (keeping a few old ones as file.1, file.2, ...) once
+    the file grows past max_bytes. Everything still queued is written when
+    the Logger is closed or the program exits.
     """
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, max_bytes=1024*1024, backups=3, batch_bytes=64*1024, flush_interval=0.5):
         # File path of the file to write to
         self.file_path = file_path
 
+        # The thread only gets the queue (not the Logger), so the Logger can still be deleted
+        self.queue = Queue()
+        self.writer = Thread(target=writeLoop, name="Logger", daemon=True,
+                             args=(self.queue, file_path, max_bytes, backups, batch_bytes, flush_interval))
+        self.writer.start()
+        self.finalizer = weakref.finalize(self, stopWriter, self.queue, self.writer)
+
 
     def __del__(self):
         """
@@ -51,11 +164,23 @@ class Logger(metaclass=LoggerMeta):
 
     def log(self, string_to_log: str):
         """
-        Takes in a string and appends it to the given file.
+        Takes in a string and queues it to be appended to the given file.
         """
-        # Open the file and write to it
-        open_file = open(self.file_path, "a")
-        open_file.write(string_to_log)
+        self.queue.put(string_to_log)
 
-        # Done writing so close file
-        open_file.close()
+
+    def flush(self):
+        """
+        Waits until everything logged so far has been written.
+        """
+        if self.writer.is_alive():
+            flushed = Event()
+            self.queue.put(flushed)
+            flushed.wait()
+
+
+    def close(self):
+        """
+        Writes everything still queued and stops the writer thread.
+        """
+        self.finalizer()
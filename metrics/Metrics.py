@@ -0,0 +1,47 @@
+class Metrics():
+    """
+    Counters for one generation, kept up to date by the Generator as it searches
+    (see Generator.metrics, and metrics_callback for reading them during a run).
+
+    decisions           Tiles the search chose and collapsed
+    forced              Tiles the propagation rules collapsed
+    propagations        times a collapse was propagated to its peers
+    domain_removals     values removed from uncollapsed Tiles' entropy
+    zero_entropy        decisions rejected because a peer would have no entropy left
+    contradictions      decisions undone because the propagation rules failed
+    nodes               value choices made (including failed ones)
+    backtracks          decisions undone for lack of values
+    max_depth           the most decisions on the history at once
+    max_backtrack_run   the most decisions undone in a row (the worst thrashing)
+    restarts            times the board was cleared to start over
+    select_time         seconds spent choosing Tiles and values
+    propagate_time      seconds spent propagating (including the zero entropy search)
+    undo_time           seconds spent undoing propagation while backtracking
+    """
+    COUNTERS = ["decisions", "forced", "propagations", "domain_removals", "zero_entropy",
+                "contradictions", "nodes", "backtracks", "max_depth", "max_backtrack_run", "restarts"]
+    TIMERS = ["select_time", "propagate_time", "undo_time"]
+
+    def __init__(self):
+        self.reset()
+
+
+    def reset(self):
+        """
+        Zeroes every counter and timer.
+        """
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        for name in self.TIMERS:
+            setattr(self, name, 0.0)
+
+
+    def asDict(self):
+        """
+        Returns every counter and timer by name (for logging or exporting).
+        """
+        return { name: getattr(self, name) for name in self.COUNTERS + self.TIMERS }
+
+
+    def __repr__(self):
+        return f"Metrics({', '.join(f'{name}={value}' for name, value in self.asDict().items())})"
@@ -0,0 +1,77 @@
+from tile.Tile import Tile # For type verification
+
+
+class EntropyBuckets():
+    """
+    An incremental index of the uncollapsed Tiles, grouped into buckets by
+    entropy count, so the lowest entropy Tiles can be found without
+    scanning the grid.
+
+    Whoever changes a Tile's entropy (propagation and backtracking) keeps
+    the index up to date with add(), remove(), and update(); each costs O(1).
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self.buckets = [ [] for i in range(size+1) ]  # buckets[count] is a list of Tiles
+        self.counts = {}        # Tile -> the bucket it is in
+        self.positions = {}     # Tile -> its index inside that bucket
+        self.lowest_bucket = size + 1   # No non-empty bucket is lower than this
+
+
+    def clear(self):
+        """
+        Empties every bucket.
+        """
+        for bucket in self.buckets:
+            bucket.clear()
+        self.counts.clear()
+        self.positions.clear()
+        self.lowest_bucket = self.size + 1
+
+
+    def add(self, tile: Tile, count: int):
+        """
+        Adds an uncollapsed Tile with the given entropy count.
+        """
+        bucket = self.buckets[count]
+        self.counts[tile] = count
+        self.positions[tile] = len(bucket)
+        bucket.append(tile)
+        if count < self.lowest_bucket:
+            self.lowest_bucket = count
+
+
+    def remove(self, tile: Tile):
+        """
+        Removes a Tile (when it collapses) by swapping it with the last Tile in its bucket.
+        """
+        bucket = self.buckets[self.counts.pop(tile)]
+        index = self.positions.pop(tile)
+        last_tile = bucket.pop()
+        if last_tile is not tile:
+            bucket[index] = last_tile
+            self.positions[last_tile] = index
+
+
+    def update(self, tile: Tile, count: int):
+        """
+        Moves an uncollapsed Tile to the bucket for its new entropy count.
+        """
+        if self.counts[tile] != count:
+            self.remove(tile)
+            self.add(tile, count)
+
+
+    def lowest(self):
+        """
+        Returns the list of uncollapsed Tiles with the lowest non-zero entropy,
+        or None if there are no such Tiles. The list must not be modified.
+        """
+        count = max(self.lowest_bucket, 1)
+        while count <= self.size and len(self.buckets[count]) == 0:
+            count += 1
+        self.lowest_bucket = count
+
+        if count > self.size:
+            return None
+        return self.buckets[count]
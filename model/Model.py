@@ -1,8 +1,20 @@
 from tile.Tile import Tile # For type verification
+from tile.Entropy import entropyCount, entropyValues, fromValues, valueBit
+from solver.Solver import Solver
 from typing import List
-from random import choice
+import random
+
+GAMIFY_NODE_BUDGET = 10     # Solver guesses allowed per removal; a removal that needs more is skipped
 
 class Model():
+
+    def __init__(self, rng=None):
+        """
+        Optionally takes a random.Random instance to make every choice
+        with; defaults to the module-level random functions.
+        """
+        self.random = rng if rng != None else random
+
     
     def getValidTiles(self, tile_grid: List[List[Tile]]):
         """
@@ -21,8 +33,9 @@ class Model():
                 if not(tile.collapsed):
                     valid_tiles.append(tile)
                     # Update lowest entropy if new lowest is found
-                    if (len(tile.entropy) < lowest_entropy) and (len(tile.entropy) != 0):
-                        lowest_entropy = len(tile.entropy)
+                    tile_entropy = entropyCount(tile.entropy)
+                    if (tile_entropy < lowest_entropy) and (tile_entropy != 0):
+                        lowest_entropy = tile_entropy
 
 
         # Before returning the list, verify that it isn't empty
@@ -32,7 +45,7 @@ class Model():
         # Only return the Tiles with entropy = lowest_entropy
         new_valid_tiles = []
         for tile in valid_tiles:
-            if len(tile.entropy) == lowest_entropy:
+            if entropyCount(tile.entropy) == lowest_entropy:
                 new_valid_tiles.append(tile)
 
         if len(new_valid_tiles) == 0:
@@ -46,63 +59,114 @@ class Model():
         Given a list of uncollapsed tiles, this method will choose a
         random tile and, for that tile, a random value and return them.
         """
-        random_tile = choice(valid_tiles)
+        random_tile = self.random.choice(valid_tiles)
 
         return random_tile
 
     
     def chooseRandomValue(self, tile: Tile, exclude: List[int]):
         """
-        Given a Tile, will return a random value from its entropy list
+        Given a Tile, will return a random value from its entropy
         that is not included in the exclude list.
 
         Returns None if there are no values to choose from after the exclusions.
         """
-        # Before choosing, remove values that must be excluded
-        smaller_entropy_list = tile.entropy.copy()
-        for val_to_remove in exclude:
-            while smaller_entropy_list.count(val_to_remove) > 0:
-                smaller_entropy_list.remove(val_to_remove)
+        # Before choosing, mask out values that must be excluded
+        smaller_entropy_list = entropyValues(tile.entropy & ~fromValues(exclude))
 
         # Verify that list isn't empty
         if len(smaller_entropy_list) == 0:
             return None
 
         # Choose and return a random value from the new entropy list
-        random_value = choice(smaller_entropy_list)
+        random_value = self.random.choice(smaller_entropy_list)
         return random_value
 
 
-    def produceGamifyTiles(self, num_to_produce: int, tile_grid: List[List[Tile]]):
+    def chooseLeastConstrainingValue(self, tile: Tile, exclude: List[int], peers: List[Tile]):
         """
-        Chooses a number of random coords in the grid boundaries
-        based on the parameter num_to_produce.
-        Returns a list of (x, y) tuples.
+        Given a Tile and its peers, will return the value from its entropy
+        (not included in the exclude list) that the fewest uncollapsed peers
+        still allow, so collapsing it removes the fewest options.
+        Ties are broken randomly.
+
+        Returns None if there are no values to choose from after the exclusions.
         """
-        # Produce a list of all tiles
-        all_tiles = []
+        smaller_entropy_list = entropyValues(tile.entropy & ~fromValues(exclude))
 
-        grid_length = len(tile_grid)
-        for column in range(grid_length):
-            for row in range(grid_length):
-                all_tiles.append(tile_grid[column][row])
+        # Verify that list isn't empty
+        if len(smaller_entropy_list) == 0:
+            return None
 
-        # Pick num_to_produce Tiles out of the list
-        chosen_tiles = []
+        # Count how many uncollapsed peers each value would be removed from
+        best_values = []
+        best_count = len(peers) + 1
+        for value in smaller_entropy_list:
+            value_bit = valueBit(value)
+            count = 0
+            for peer in peers:
+                if not(peer.collapsed) and peer.entropy & value_bit:
+                    count += 1
 
-        for i in range(num_to_produce):
-            chosen_tile = choice(all_tiles)     # Chose a random tile from the list
-            all_tiles.remove(chosen_tile)       # Remove it from the list so it isn't chosen again
-            chosen_tiles.append(chosen_tile)    # Add chosen tile to list of chosen tiles
+            if count < best_count:
+                best_count = count
+                best_values = [value]
+            elif count == best_count:
+                best_values.append(value)
 
-        # Create a list of coordinates to be returned
-        coords = []
+        return self.random.choice(best_values)
 
-        for tile in chosen_tiles:
-            coords.append(tile.coord)
 
-        return coords
+    def produceGamifyTiles(self, num_to_produce: int, tile_grid: List[List[Tile]]):
+        """
+        Chooses up to num_to_produce random coords of filled Tiles to clear,
+        one at a time, keeping a removal only if the puzzle left behind
+        still has exactly one solution.
+        Returns a list of (x, y) tuples; it may be shorter than num_to_produce
+        when no more Tiles can be cleared without losing uniqueness.
+        """
+        grid_length = len(tile_grid)
+        grid = [ [ tile_grid[x][y].value for y in range(grid_length) ] for x in range(grid_length) ]
 
+        return self.produceGamifyCoords(num_to_produce, grid)
 
 
+    def produceGamifyCoords(self, num_to_produce: int, grid: List[List[int]], node_budget=GAMIFY_NODE_BUDGET):
+        """
+        The same as produceGamifyTiles(), but for a solved grid of values
+        indexed as grid[x][y] (so headless code doesn't need Tiles).
+        Returns a list of (x, y) tuples.
+        """
+        return list(self.iterGamifyCoords(num_to_produce, grid, node_budget))
+
 
+    def iterGamifyCoords(self, num_to_produce: int, grid: List[List[int]], node_budget=GAMIFY_NODE_BUDGET):
+        """
+        Yields the coords produceGamifyCoords() returns one at a time, as they are
+        found, so a caller can show them while the rest are still being checked.
+        A removal the Solver can't prove unique within node_budget guesses
+        counts as not unique and is skipped, which keeps the cost of every
+        check bounded (None for no limit).
+        """
+        grid_length = len(grid)
+        solver = Solver(grid_length)
+        puzzle = [ column[:] for column in grid ]
+
+        # Try the Tiles in a random order
+        all_coords = [ (x, y) for x in range(grid_length) for y in range(grid_length) ]
+        self.random.shuffle(all_coords)
+
+        produced = 0
+        for x, y in all_coords:
+            if produced == num_to_produce:
+                break
+
+            value = puzzle[x][y]
+            puzzle[x][y] = None
+
+            # Keep the removal only if the counter still finds one solution (stopping at two)
+            if solver.countSolutions(puzzle, 2, node_budget) == 1:
+                produced += 1
+                yield (x, y)
+            else:
+                puzzle[x][y] = value
@@ -0,0 +1,205 @@
+"""
+Opt-in profiling for the app and the command line (their --profile option).
+
+A Profiler runs cProfile on every thread it is asked to (the GUI runs the
+Generator on a worker thread), then writes the combined pstats file and a
+short text report of the time spent in each phase of generation.
+"""
+from contextlib import contextmanager
+from threading import Lock
+import cProfile
+import io
+import os
+import pstats
+
+
+# The functions that make up each phase, as (file, function name) pairs
+PHASES = {
+    "Model selection": [
+        ("model/Model.py", "chooseRandomTile"),
+        ("model/Model.py", "chooseRandomValue"),
+        ("model/Model.py", "chooseLeastConstrainingValue"),
+        ("model/EntropyBuckets.py", "lowest"),
+    ],
+    "Propagation": [
+        ("generator/Generator.py", "propagateEntropy"),
+        ("generator/Generator.py", "propagateRules"),
+        ("generator/Generator.py", "forceValue"),
+        ("generator/Generator.py", "narrowEntropy"),
+        ("generator/Generator.py", "searchHiddenSingles"),
+        ("generator/Generator.py", "searchNakedPairs"),
+    ],
+    "Zero entropy search": [
+        ("generator/Generator.py", "searchZeroEntropyPropagation"),
+    ],
+    "Reversal": [
+        ("generator/Generator.py", "reverseEntropy"),
+    ],
+    "Rendering": [
+        ("view/View.py", "drainChanges"),
+        ("view/BoardCanvas.py", "setTile"),
+        ("view/BoardCanvas.py", "redraw"),
+        ("view/BoardCanvas.py", "flush"),
+    ],
+    "Logging": [
+        ("logger/logger.py", "log"),
+        ("view/View.py", "logGridValues"),
+        ("view/View.py", "logGridEntropyCount"),
+        ("view/View.py", "logGridEntropyValues"),
+    ],
+}
+
+
+def phaseOf(function: tuple):
+    """
+    Returns the phase a pstats (file, line, name) key belongs to, or None.
+    """
+    file_name = function[0].replace(os.sep, "/")
+    for phase, members in PHASES.items():
+        for member_file, member_name in members:
+            if function[2] == member_name and file_name.endswith(member_file):
+                return phase
+    return None
+
+
+def callerPhases(stats: pstats.Stats, function: tuple, shares=None):
+    """
+    Returns the phases a function is called within, as a dict of
+    phase -> share of its time (None for time outside every phase).
+    Untagged callers pass on the phases they were called within.
+    """
+    if shares == None:
+        shares = {}
+    if function in shares:
+        return shares[function]
+    shares[function] = { None: 1.0 }    # Stands in while a recursive call is being worked out
+
+    callers = stats.stats[function][4] if function in stats.stats else {}
+    total = sum(caller_stats[3] for caller_stats in callers.values())
+    if total == 0:
+        return shares[function]
+
+    phases = {}
+    for caller, caller_stats in callers.items():
+        caller_phase = phaseOf(caller)
+        context = { caller_phase: 1.0 } if caller_phase != None else callerPhases(stats, caller, shares)
+        for phase, share in context.items():
+            phases[phase] = phases.get(phase, 0.0) + caller_stats[3] / total * share
+
+    shares[function] = phases
+    return phases
+
+
+def phaseTimes(stats: pstats.Stats):
+    """
+    Returns a dict of phase -> seconds. Time spent in a phase called from
+    inside another phase (logging at the end of a Rendering call, say)
+    counts only for the inner phase, so every second is counted once and
+    nested calls of the same phase (propagateRules -> forceValue ->
+    propagateEntropy) count once too.
+    """
+    times = { phase: 0.0 for phase in PHASES }
+    shares = {}
+    for function, (primitive_calls, calls, total_time, cumulative_time, callers) in stats.stats.items():
+        phase = phaseOf(function)
+        if phase == None:
+            continue
+
+        if len(callers) == 0:
+            times[phase] += cumulative_time
+            continue
+
+        for caller, caller_stats in callers.items():
+            caller_phase = phaseOf(caller)
+            context = { caller_phase: 1.0 } if caller_phase != None else callerPhases(stats, caller, shares)
+            for outer_phase, share in context.items():
+                if outer_phase == phase:
+                    continue
+                seconds = caller_stats[3] * share    # The cumulative time spent under this caller
+                times[phase] += seconds
+                if outer_phase != None:
+                    times[outer_phase] -= seconds   # The outer phase's cumulative time included it
+    return times
+
+
+def formatReport(stats: pstats.Stats, title: str):
+    """
+    Returns the per-phase breakdown followed by the top functions, as text.
+    """
+    total = stats.total_tt
+    lines = [ f"{title} ({total:.3f}s profiled)", "",
+              f"{'Phase':<24}{'Seconds':>10}{'Share':>9}" ]
+
+    times = phaseTimes(stats)
+    for phase, seconds in times.items():
+        share = seconds / total * 100 if total else 0
+        lines.append(f"{phase:<24}{seconds:>10.3f}{share:>8.1f}%")
+    other = max(total - sum(times.values()), 0)
+    lines.append(f"{'Other':<24}{other:>10.3f}{(other / total * 100 if total else 0):>8.1f}%")
+
+    # The usual pstats table, for whatever the phases don't cover
+    table = io.StringIO()
+    stats.stream = table
+    stats.sort_stats("cumulative").print_stats(25)
+    lines += ["", table.getvalue()]
+
+    return "\n".join(lines)
+
+
+class Profiler():
+    """
+    Collects cProfile data from any number of threads and writes it as
+    output_base.pstats (for pstats or snakeviz) and output_base.txt.
+    """
+    def __init__(self, output_base: str):
+        self.output_base = output_base
+        self.profiles = []
+        self.lock = Lock()
+
+
+    @contextmanager
+    def profile(self):
+        """
+        Profiles the calling thread for the duration of the with block.
+
+        Since Python 3.12 cProfile runs on the process-wide sys.monitoring:
+        a profile started on one thread already sees every thread, and a
+        second one can't be enabled while it runs. The block then simply
+        runs under the profile that is already active.
+        """
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # Another profile is already active (and sees this thread)
+            yield
+            return
+
+        with self.lock:
+            self.profiles.append(profile)
+        try:
+            yield
+        finally:
+            profile.disable()
+
+
+    def write(self, title="Profile"):
+        """
+        Combines every thread's profile and writes both files.
+        Returns the paths written.
+        """
+        with self.lock:
+            profiles = [ profile for profile in self.profiles if profile.getstats() ]
+        if len(profiles) == 0:
+            return []
+
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+
+        stats_path = f"{self.output_base}.pstats"
+        report_path = f"{self.output_base}.txt"
+        stats.dump_stats(stats_path)
+        with open(report_path, "w") as file:
+            file.write(formatReport(stats, title))
+
+        return [stats_path, report_path]
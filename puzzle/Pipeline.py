@@ -0,0 +1,102 @@
+"""
+A streaming pipeline for difficulty-graded puzzles:
+
+    boardStream -> (augmentStream) -> carveStream -> rateStream -> collectByDifficulty
+
+Every stage is a generator that pulls from the one before it, so a batch
+job can keep going (without holding anything but the current puzzle)
+until every difficulty bin has as many puzzles as it needs.
+"""
+from augment.Augment import augmentBoard
+from generator.Generator import Generator, defaultOptions
+from model.Model import Model
+from puzzle.Rater import Rater, DIFFICULTIES
+from random import Random
+from typing import Iterable
+
+
+def boardStream(size: int, seed=None, **options):
+    """
+    Endlessly yields solved grids, each from its own seed drawn from seed.
+    Any options are passed through to the Generator, on top of its
+    defaultOptions() for the size.
+    """
+    options = { **defaultOptions(size), **options }
+    seed_stream = Random(seed)
+    while True:
+        yield Generator(size, seed_stream.getrandbits(64), **options).generate()
+
+
+def augmentStream(boards: Iterable, per_board: int, seed=None):
+    """
+    Yields each board followed by up to per_board distinct boards derived
+    from it by symmetry (see augment/Augment.py).
+    """
+    seed_stream = Random(seed)
+    for board in boards:
+        yield board
+        yield from augmentBoard(board, per_board, seed_stream.getrandbits(64))
+
+
+def carveStream(boards: Iterable, seed=None, fractions=(0.5, 0.8)):
+    """
+    Clears a random share (between the two fractions) of each board's Tiles,
+    keeping only removals that leave a single solution.
+    Yields (puzzle, solution) tuples.
+    """
+    rng = Random(seed)
+    model = Model(rng)
+    for solution in boards:
+        size = len(solution)
+        num_to_remove = int(size * size * rng.uniform(*fractions))
+
+        puzzle = [ column[:] for column in solution ]
+        for x, y in model.produceGamifyCoords(num_to_remove, solution):
+            puzzle[x][y] = None
+        yield (puzzle, solution)
+
+
+def rateStream(puzzles: Iterable):
+    """
+    Rates each puzzle with the logical Rater.
+    Yields (difficulty, techniques, puzzle, solution) tuples.
+    """
+    raters = {}     # One Rater per size
+    for puzzle, solution in puzzles:
+        size = len(puzzle)
+        if size not in raters:
+            raters[size] = Rater(size)
+
+        difficulty, techniques, solved = raters[size].rate(puzzle)
+        yield (difficulty, techniques, puzzle, solution)
+
+
+def collectByDifficulty(rated: Iterable, per_bin: int, bins=DIFFICULTIES):
+    """
+    Passes on rated puzzles while their difficulty bin still has room,
+    discarding the rest, and stops once every bin in bins holds per_bin.
+    Yields (difficulty, puzzle, solution) tuples.
+    """
+    counts = { difficulty: 0 for difficulty in bins }
+    remaining = per_bin * len(bins)
+
+    for difficulty, techniques, puzzle, solution in rated:
+        if remaining == 0:
+            return
+        if difficulty not in counts or counts[difficulty] >= per_bin:
+            continue
+
+        counts[difficulty] += 1
+        remaining -= 1
+        yield (difficulty, puzzle, solution)
+
+
+def gradedPuzzles(size: int, per_bin: int, seed=None, bins=DIFFICULTIES, **options):
+    """
+    Runs the whole pipeline for one board size.
+    Yields (difficulty, puzzle, solution) tuples until every bin holds per_bin.
+    """
+    seed_stream = Random(seed)
+    boards = boardStream(size, seed_stream.getrandbits(64), **options)
+    puzzles = carveStream(boards, seed_stream.getrandbits(64))
+    return collectByDifficulty(rateStream(puzzles), per_bin, bins)
@@ -0,0 +1,300 @@
+from tile.Peers import getPeerTable
+from tile.Entropy import fullEntropy
+from typing import List
+
+
+# The difficulty bins, easiest first
+DIFFICULTIES = ["easy", "medium", "hard", "expert"]
+
+# The bin each technique puts a puzzle in (a puzzle is as hard as the hardest technique it needs)
+TECHNIQUE_LEVELS = {
+    "naked_single": 0,
+    "hidden_single": 0,
+    "locked_candidates": 1,
+    "naked_pair": 2,
+    "hidden_pair": 2,
+    "x_wing": 3,
+}
+
+
+class Rater():
+    """
+    Rates puzzles by solving them the way a person would: always using the
+    simplest technique that makes progress, and recording which techniques
+    were needed. Puzzles these techniques can't finish are rated expert.
+
+    Candidates are bitmasks in flat lists indexed by x * size + y. Every
+    elimination queues the cell if it became a naked single and marks its
+    units for the hidden single check, so the singles (which solve most of
+    every puzzle) never rescan the board. The other techniques scan the
+    units, but only once the singles are stuck.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self.full_entropy = fullEntropy(size)
+
+        table = getPeerTable(size)
+        self.peers = [ [ px * size + py for px, py in table.peers[x][y] ]
+                       for x in range(size) for y in range(size) ]
+        self.units = [ [ ux * size + uy for ux, uy in unit ] for unit in table.units ]
+        self.cell_units = [ table.cell_units[x][y] for x in range(size) for y in range(size) ]
+
+        # Units are ordered columns, then rows, then subsquares
+        self.columns = self.units[:size]
+        self.rows = self.units[size:2*size]
+        self.subsquares = self.units[2*size:]
+
+
+    def rate(self, puzzle: List[List[int]]):
+        """
+        Solves puzzle[x][y] (None or 0 means empty) with logic alone.
+
+        Returns a (difficulty, techniques, solved) tuple, where techniques
+        counts how many times each technique made progress, and solved is
+        False if the techniques got stuck before the grid was filled.
+        """
+        size = self.size
+        self.values = [0] * (size * size)
+        self.candidates = [self.full_entropy] * (size * size)
+        self.filled = 0
+        self.naked_queue = []
+        self.dirty_units = set(range(len(self.units)))
+
+        for x in range(size):
+            for y in range(size):
+                if puzzle[x][y]:
+                    self.place(x * size + y, puzzle[x][y])
+
+        techniques = {}
+        steps = [
+            ("naked_single", self.nakedSingle),
+            ("hidden_single", self.hiddenSingle),
+            ("locked_candidates", self.lockedCandidates),
+            ("naked_pair", self.nakedPairs),
+            ("hidden_pair", self.hiddenPairs),
+            ("x_wing", self.xWing),
+        ]
+
+        while self.filled < size * size:
+            # Use the simplest technique that makes progress, then start over
+            for name, technique in steps:
+                if technique():
+                    techniques[name] = techniques.get(name, 0) + 1
+                    break
+            else:
+                break   # Stuck
+
+        solved = self.filled == size * size
+        level = max([ TECHNIQUE_LEVELS[name] for name in techniques ] + [0])
+        if not(solved):
+            level = len(DIFFICULTIES) - 1
+
+        return (DIFFICULTIES[level], techniques, solved)
+
+
+    def place(self, cell: int, value: int):
+        """
+        Fills the cell and removes its value from every peer.
+        """
+        if self.values[cell]:
+            return
+        value_bit = 1 << (value - 1)
+        if not(self.candidates[cell] & value_bit):
+            raise Exception("The puzzle breaks the rules of Sudoku!")
+
+        self.values[cell] = value
+        self.candidates[cell] = value_bit
+        self.filled += 1
+        self.dirty_units.update(self.cell_units[cell])
+
+        for peer in self.peers[cell]:
+            self.eliminate(peer, value_bit)
+
+
+    def eliminate(self, cell: int, bits: int):
+        """
+        Removes bits from an empty cell's candidates.
+        Returns True if anything was removed.
+        """
+        candidates = self.candidates[cell]
+        if self.values[cell] or not(candidates & bits):
+            return False
+
+        candidates &= ~bits
+        if candidates == 0:
+            raise Exception("The puzzle breaks the rules of Sudoku!")
+
+        self.candidates[cell] = candidates
+        self.dirty_units.update(self.cell_units[cell])
+        if candidates & (candidates - 1) == 0:
+            self.naked_queue.append(cell)
+        return True
+
+
+    def nakedSingle(self):
+        """
+        Fills one cell that has a single candidate left.
+        """
+        while self.naked_queue:
+            cell = self.naked_queue.pop()
+            if self.values[cell] == 0:
+                self.place(cell, self.candidates[cell].bit_length())
+                return True
+        return False
+
+
+    def hiddenSingle(self):
+        """
+        Fills one value that has a single place left in a unit,
+        looking only at units that changed since they were last checked.
+        """
+        while self.dirty_units:
+            unit = self.units[self.dirty_units.pop()]
+
+            placed = 0
+            seen_once = 0
+            seen_twice = 0
+            for cell in unit:
+                if self.values[cell]:
+                    placed |= self.candidates[cell]
+                else:
+                    seen_twice |= seen_once & self.candidates[cell]
+                    seen_once |= self.candidates[cell]
+
+            hidden = seen_once & ~seen_twice & ~placed
+            if hidden:
+                value_bit = hidden & -hidden
+                for cell in unit:
+                    if self.values[cell] == 0 and self.candidates[cell] & value_bit:
+                        self.place(cell, value_bit.bit_length())
+                        return True
+        return False
+
+
+    def valuePlaces(self, unit: List[int]):
+        """
+        Returns a dict of value bit -> list of empty cells in the unit that allow it.
+        """
+        places = {}
+        for cell in unit:
+            if self.values[cell] == 0:
+                mask = self.candidates[cell]
+                while mask:
+                    value_bit = mask & -mask
+                    mask ^= value_bit
+                    places.setdefault(value_bit, []).append(cell)
+        return places
+
+
+    def lockedCandidates(self):
+        """
+        When a value's places in a subsquare all share a row or column, removes it
+        from the rest of that line (pointing); when a value's places in a line all
+        share a subsquare, removes it from the rest of that subsquare (claiming).
+        """
+        progress = False
+
+        for unit_index, unit in enumerate(self.units):
+            for value_bit, cells in self.valuePlaces(unit).items():
+                if len(cells) < 2:
+                    continue
+
+                # The other units every place shares (besides this one)
+                shared = set(self.cell_units[cells[0]])
+                for cell in cells[1:]:
+                    shared &= set(self.cell_units[cell])
+                shared.discard(unit_index)
+
+                for other_index in shared:
+                    for other_cell in self.units[other_index]:
+                        if other_cell not in cells and self.eliminate(other_cell, value_bit):
+                            progress = True
+            if progress:
+                return True
+
+        return False
+
+
+    def nakedPairs(self):
+        """
+        When two empty cells in a unit have the same two candidates left,
+        removes those candidates from the rest of the unit.
+        """
+        for unit in self.units:
+            pair_cells = {}
+            for cell in unit:
+                candidates = self.candidates[cell]
+                if self.values[cell] == 0 and candidates.bit_count() == 2:
+                    if candidates not in pair_cells:
+                        pair_cells[candidates] = cell
+                        continue
+
+                    progress = False
+                    for other_cell in unit:
+                        if other_cell != cell and other_cell != pair_cells[candidates]:
+                            if self.eliminate(other_cell, candidates):
+                                progress = True
+                    if progress:
+                        return True
+        return False
+
+
+    def hiddenPairs(self):
+        """
+        When two values in a unit can only go in the same two cells,
+        removes every other candidate from those cells.
+        """
+        for unit in self.units:
+            pair_values = {}
+            for value_bit, cells in self.valuePlaces(unit).items():
+                if len(cells) != 2:
+                    continue
+
+                cells = tuple(cells)
+                if cells not in pair_values:
+                    pair_values[cells] = value_bit
+                    continue
+
+                keep = value_bit | pair_values[cells]
+                progress = False
+                for cell in cells:
+                    if self.eliminate(cell, self.candidates[cell] & ~keep):
+                        progress = True
+                if progress:
+                    return True
+        return False
+
+
+    def xWing(self):
+        """
+        When a value has exactly two places in each of two rows, and those places
+        share the same two columns, removes it from the rest of those columns
+        (and the same with rows and columns swapped).
+        """
+        for lines, crossing in [(self.rows, self.columns), (self.columns, self.rows)]:
+            crossing_of = {}    # cell -> index of its crossing line
+            for index, line in enumerate(crossing):
+                for cell in line:
+                    crossing_of[cell] = index
+
+            seen = {}   # (value bit, crossing pair) -> line index
+            for line_index, line in enumerate(lines):
+                for value_bit, cells in self.valuePlaces(line).items():
+                    if len(cells) != 2:
+                        continue
+
+                    key = (value_bit, crossing_of[cells[0]], crossing_of[cells[1]])
+                    if key not in seen:
+                        seen[key] = line_index
+                        continue
+
+                    # Remove the value from both crossing lines, except in the two lines
+                    wing_cells = set(line) | set(lines[seen[key]])
+                    progress = False
+                    for crossing_index in key[1:]:
+                        for cell in crossing[crossing_index]:
+                            if cell not in wing_cells and self.eliminate(cell, value_bit):
+                                progress = True
+                    if progress:
+                        return True
+        return False
@@ -4,6 +4,7 @@ class Snapshot():
     Defines everything stored inside a snapshot.
     To be used when backtracking.
     """
-    def __init__(self, tile, attempted_value):
+    def __init__(self, tile, attempted_value, trail_mark=0):
         self.collapsed_tile = tile                  # The Tile that was collapsed
         self.collapsed_values  = [attempted_value]  # A list of values that have been tried for this Tile
+        self.trail_mark = trail_mark                # Length of the Generator's trail before this collapse propagated
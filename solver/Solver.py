@@ -0,0 +1,164 @@
+from tile.Peers import getPeerTable
+from tile.Entropy import fullEntropy
+from typing import List
+
+
+class BudgetExhausted(Exception):
+    """
+    Raised inside the search when countSolutions() runs out of node_budget.
+    """
+
+
+class Solver():
+    """
+    A fast solution counter for partially filled grids.
+
+    Candidates are bitmasks (see tile/Entropy.py) kept in flat lists indexed
+    by x * size + y, with peers and units taken from the memoized peer table.
+    Every guess is followed by naked and hidden singles until nothing changes,
+    so most 9x9 and 16x16 puzzles are counted with very few guesses.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self.full_entropy = fullEntropy(size)
+
+        table = getPeerTable(size)
+        self.peers = [ [ px * size + py for px, py in table.peers[x][y] ]
+                       for x in range(size) for y in range(size) ]
+        self.units = [ [ ux * size + uy for ux, uy in unit ] for unit in table.units ]
+        self.cell_units = [ table.cell_units[x][y] for x in range(size) for y in range(size) ]
+        self.nodes_left = None    # Guesses left in the current count (None for no limit)
+
+
+    def countSolutions(self, grid: List[List[int]], limit=2, node_budget=None):
+        """
+        Counts the solutions of grid[x][y] (None or 0 means empty),
+        stopping as soon as limit solutions have been found.
+        Returns None if node_budget guesses weren't enough to decide.
+        """
+        self.nodes_left = node_budget
+        size = self.size
+        values = [0] * (size * size)
+        candidates = [self.full_entropy] * (size * size)
+
+        queue = []
+        for x in range(size):
+            for y in range(size):
+                if grid[x][y]:
+                    queue.append((x * size + y, grid[x][y]))
+
+        if not(self.propagate(values, candidates, queue)):
+            return 0
+        try:
+            return self.search(values, candidates, limit)
+        except BudgetExhausted:
+            return None
+
+
+    def search(self, values: List[int], candidates: List[int], limit: int):
+        """
+        Counts solutions by guessing each value of the most constrained empty cell.
+        """
+        # Find the empty cell with the fewest candidates
+        best_cell = -1
+        best_count = self.size + 1
+        for cell, value in enumerate(values):
+            if value == 0:
+                count = candidates[cell].bit_count()
+                if count < best_count:
+                    best_cell = cell
+                    best_count = count
+                    if count == 2:
+                        break
+
+        if best_cell == -1:
+            return 1    # Every cell is filled
+
+        if self.nodes_left != None:
+            if self.nodes_left == 0:
+                raise BudgetExhausted()
+            self.nodes_left -= 1
+
+        solutions = 0
+        mask = candidates[best_cell]
+        while mask:
+            value_bit = mask & -mask
+            mask ^= value_bit
+
+            new_values = values.copy()
+            new_candidates = candidates.copy()
+            if self.propagate(new_values, new_candidates, [(best_cell, value_bit.bit_length())]):
+                solutions += self.search(new_values, new_candidates, limit - solutions)
+                if solutions >= limit:
+                    break
+
+        return solutions
+
+
+    def propagate(self, values: List[int], candidates: List[int], queue: list):
+        """
+        Places every (cell, value) in the queue, then keeps placing naked and
+        hidden singles until there are none left. Hidden singles are only
+        looked for in units where a candidate was removed.
+        Returns False if a contradiction is found.
+        """
+        peers = self.peers
+        cell_units = self.cell_units
+        units = self.units
+        full_entropy = self.full_entropy
+        dirty_units = set()
+
+        while True:
+            # Place the queued values and remove them from their peers
+            while queue:
+                cell, value = queue.pop()
+                value_bit = 1 << (value - 1)
+                if values[cell]:
+                    if values[cell] != value:
+                        return False
+                    continue
+                if not(candidates[cell] & value_bit):
+                    return False
+
+                values[cell] = value
+                candidates[cell] = value_bit
+                dirty_units.update(cell_units[cell])
+                for peer in peers[cell]:
+                    peer_candidates = candidates[peer]
+                    if peer_candidates & value_bit:
+                        peer_candidates ^= value_bit
+                        if peer_candidates == 0:
+                            return False
+                        candidates[peer] = peer_candidates
+                        dirty_units.update(cell_units[peer])
+                        if values[peer] == 0 and peer_candidates & (peer_candidates - 1) == 0:
+                            queue.append((peer, peer_candidates.bit_length()))
+
+            if len(dirty_units) == 0:
+                return True
+
+            # Look for values with only one place left in the units that changed
+            for unit_index in dirty_units:
+                unit = units[unit_index]
+                placed = 0
+                seen_once = 0
+                seen_twice = 0
+                for cell in unit:
+                    if values[cell]:
+                        placed |= candidates[cell]
+                    else:
+                        seen_twice |= seen_once & candidates[cell]
+                        seen_once |= candidates[cell]
+
+                if full_entropy & ~(placed | seen_once):
+                    return False
+
+                hidden = seen_once & ~seen_twice & ~placed
+                while hidden:
+                    value_bit = hidden & -hidden
+                    hidden ^= value_bit
+                    for cell in unit:
+                        if values[cell] == 0 and candidates[cell] & value_bit:
+                            queue.append((cell, value_bit.bit_length()))
+                            break
+            dirty_units.clear()
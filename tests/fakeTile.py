@@ -1,12 +1,14 @@
 
 from typing import List
+from tile.Entropy import fromValues
 
 
 class FakeTile():
     """
     For testing purposes, this class will represent a fake Tile object
     that only has the collapsed and entropy attributes.
+    The entropy is given as a list and stored as a bitmask, like a real Tile.
     """
     def __init__(self, collapsed: bool, entropy: List[int]):
         self.collapsed = collapsed
-        self.entropy = entropy
+        self.entropy = fromValues(entropy)
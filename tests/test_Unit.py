@@ -2,7 +2,39 @@
 import unittest
 from tests.fakeTile import FakeTile
 from model.Model import Model
-from logger.logger import Logger
+from model.EntropyBuckets import EntropyBuckets
+from logger.logger import Logger, STOP, writeLoop
+from queue import Queue
+from threading import Event, Thread
+from generator.Generator import Generator
+from generator.Restarts import lubySequence
+from generator.DancingLinks import DancingLinksGenerator
+from generator.Batch import boardSeed, generateMany
+from generator.Portfolio import raceGenerate
+import multiprocessing
+from solver.Solver import Solver
+from puzzle.Rater import Rater
+from puzzle.Pipeline import gradedPuzzles
+from augment.Augment import augmentBatch, augmentBoard, canonicalForm
+from corpus.Packed import PackedCorpus, PackedWriter
+from corpus.Text import countRecords
+from tracing.Trace import TraceRecorder, readTrace, replayTrace, summarizeTrace
+from controller.Controller import Controller
+from benchmark.Benchmark import benchmarkGeneration, compareToBaseline
+from profiling.Profile import Profiler, phaseTimes
+import cli
+import os
+import subprocess
+import sys
+import tempfile
+from random import Random
+from tile.Peers import getPeerTable
+from tile.Entropy import entropyCount, entropyValues, fromValues, fullEntropy, hasValue, removeValue
+
+try:
+    import numpy    # Optional (requirements-optional.txt)
+except ImportError:
+    numpy = None
 
 """
 I had some difficulties finding methods within my program to test because
@@ -47,9 +79,529 @@ class TestMVC(unittest.TestCase):
 
         for tile in results:
             self.assertEqual(tile.collapsed, False)
-            self.assertEqual(len(tile.entropy), 1)
+            self.assertEqual(entropyCount(tile.entropy), 1)
     
 
+    def test_model_chooseLeastConstrainingValue(self):
+        """
+        Tests that the least constraining value comes from the Tile's entropy,
+        skips excluded values, and is the value the fewest uncollapsed peers allow.
+        """
+        tile = FakeTile(False, [1, 2, 3])
+        peers = [ FakeTile(False, [1, 2]), FakeTile(False, [1, 3]), FakeTile(False, [1]), FakeTile(True, [2, 3]) ]
+
+        model = Model(Random(0))
+        self.assertIn(model.chooseLeastConstrainingValue(tile, [], peers), [2, 3])   # 1 is allowed by three peers
+        self.assertEqual(model.chooseLeastConstrainingValue(tile, [3], peers), 2)
+        self.assertEqual(model.chooseLeastConstrainingValue(tile, [2, 3], peers), 1)
+        self.assertEqual(model.chooseLeastConstrainingValue(tile, [1, 2, 3], peers), None)
+
+
+    def test_entropyBuckets(self):
+        """
+        Tests that EntropyBuckets.lowest() returns the same Tiles
+        that getValidTiles() would, as Tiles are added, moved, and removed.
+        """
+        a = FakeTile(False, [1, 2])
+        b = FakeTile(False, [3, 4])
+        c = FakeTile(False, [5, 6, 7])
+
+        buckets = EntropyBuckets(9)
+        for tile in [a, b, c]:
+            buckets.add(tile, entropyCount(tile.entropy))
+        self.assertEqual(set(buckets.lowest()), {a, b})
+
+        buckets.update(c, 1)
+        self.assertEqual(buckets.lowest(), [c])
+
+        buckets.remove(c)
+        self.assertEqual(set(buckets.lowest()), {a, b})
+
+        buckets.remove(a)
+        buckets.remove(b)
+        self.assertIsNone(buckets.lowest())
+
+
+    def test_generator_solvedGrid(self):
+        """
+        Tests that the headless Generator returns a grid that
+        follows the rules of Sudoku.
+        """
+        size = 9
+        grid = Generator(size, seed=1).generate()
+        all_values = list(range(1, size+1))
+
+        # Every column and every row holds each value exactly once
+        for x in range(size):
+            self.assertEqual(sorted(grid[x]), all_values)
+        for y in range(size):
+            self.assertEqual(sorted(grid[x][y] for x in range(size)), all_values)
+
+        # Every subsquare holds each value exactly once
+        for sub_x in range(0, size, 3):
+            for sub_y in range(0, size, 3):
+                subsquare = [ grid[sub_x+i][sub_y+j] for i in range(3) for j in range(3) ]
+                self.assertEqual(sorted(subsquare), all_values)
+
+
+    def test_generateMany(self):
+        """
+        Tests that a batch from a process pool returns one valid board per
+        seed, and that each board can be generated again from its seed.
+        """
+        boards = list(generateMany(9, 6, workers=2, seed=5))
+        # Boards come back in the order they finish, so only the set of seeds is fixed
+        self.assertEqual(len(boards), 6)
+        self.assertEqual({ board_seed for board_seed, grid in boards }, { boardSeed(5, index) for index in range(6) })
+
+        table = getPeerTable(9)
+        for board_seed, grid in boards:
+            for unit in table.units:
+                self.assertEqual(sorted(grid[x][y] for x, y in unit), list(range(1, 10)))
+            self.assertEqual(Generator(9, board_seed).generate(), grid)
+
+
+    def test_restarts(self):
+        """
+        Tests the Luby restart schedule and that a node budget stops generation.
+        """
+        schedule = lubySequence(10)
+        self.assertEqual([ next(schedule) for i in range(8) ], [10, 10, 20, 10, 10, 20, 40, 10])
+
+        generator = Generator(16, seed=1, node_budget=10)
+        self.assertRaises(TimeoutError, generator.generate)
+
+        # Small budgets on small boards stop right after the budget, too
+        generator = Generator(9, seed=1, node_budget=10)
+        self.assertRaises(TimeoutError, generator.generate)
+        self.assertEqual(generator.nodes, 11)
+
+
+    def test_raceGenerate(self):
+        """
+        Tests that racing returns a valid board and stops the other racers,
+        and that TimeoutError is raised when every racer runs out of time.
+        """
+        racer_seed, value_order, grid = raceGenerate(9, racers=2, seed=4)
+        self.assertIn(value_order, ["random", "least_constraining"])
+        self.assertEqual(multiprocessing.active_children(), [])
+
+        table = getPeerTable(9)
+        for unit in table.units:
+            self.assertEqual(sorted(grid[x][y] for x, y in unit), list(range(1, 10)))
+
+        self.assertRaises(TimeoutError, raceGenerate, 49, racers=2, seed=4, time_budget=0.01)
+        self.assertEqual(multiprocessing.active_children(), [])
+
+
+    def test_generator_propagationRules(self):
+        """
+        Tests that every propagation rule still produces a valid board,
+        with every Tile collapsed exactly as the yielded changes say.
+        """
+        size = 16
+        generator = Generator(size, seed=2, naked_singles=True, hidden_singles=True, naked_pairs=True)
+
+        shown = {}
+        for x, y, value in generator.steps():
+            shown[(x, y)] = value
+
+        grid = generator.getGrid()
+        for x in range(size):
+            self.assertEqual(sorted(grid[x]), list(range(1, size+1)))
+            for y in range(size):
+                self.assertEqual(shown[(x, y)], grid[x][y])
+
+
+    def test_dancingLinks(self):
+        """
+        Tests that the Dancing Links backend solves a grid with two blanks,
+        counts the solutions of a grid with a blank row, keeps the Generator's
+        metrics, and rejects the Generator's options.
+        """
+        dlx = DancingLinksGenerator(9, seed=1)
+        grid = dlx.generate()
+        self.assertEqual(dlx.nodes, dlx.metrics.decisions)
+        self.assertEqual(dlx.nodes - dlx.backtracks, 81)   # Every placement not undone fills a Tile
+        self.assertRaises(Exception, DancingLinksGenerator, 9, 1, naked_singles=True)
+
+        # Two blanks in different rows, columns, and subsquares have one solution
+        puzzle = [ column[:] for column in grid ]
+        puzzle[0][0] = None
+        puzzle[4][4] = None
+        self.assertEqual(dlx.countSolutions(puzzle), 1)
+        self.assertEqual(dlx.solve(puzzle), grid)
+
+        # A value that breaks the rules leaves no solution at all
+        puzzle[0][0] = grid[0][1]
+        self.assertEqual(dlx.countSolutions(puzzle), 0)
+
+
+    def test_gamifyUniqueSolution(self):
+        """
+        Tests that the Tiles chosen by produceGamifyTiles() leave a
+        puzzle that the Solver counts exactly one solution for.
+        """
+        generator = Generator(9, seed=3)
+        grid = generator.generate()
+
+        coords = Model(Random(3)).produceGamifyTiles(51, generator.tile_grid)
+        self.assertEqual(len(coords), len(set(coords)))
+
+        puzzle = [ column[:] for column in grid ]
+        for x, y in coords:
+            puzzle[x][y] = None
+
+        solver = Solver(9)
+        self.assertEqual(solver.countSolutions(puzzle), 1)
+
+        # An empty board has more than one solution; the counter stops at the limit
+        self.assertEqual(solver.countSolutions([ [None] * 9 for i in range(9) ], 2), 2)
+
+        # Out of guesses counts as undecided
+        self.assertEqual(solver.countSolutions([ [None] * 9 for i in range(9) ], 2, node_budget=3), None)
+
+
+    def test_rater(self):
+        """
+        Tests that a puzzle missing one Tile is rated easy and solved with a
+        naked single, and that the pipeline fills its difficulty bins.
+        """
+        grid = Generator(9, seed=4).generate()
+        puzzle = [ column[:] for column in grid ]
+        puzzle[2][5] = None
+
+        rater = Rater(9)
+        difficulty, techniques, solved = rater.rate(puzzle)
+        self.assertEqual(difficulty, "easy")
+        self.assertTrue(solved)
+        self.assertEqual(techniques, {"naked_single": 1})
+        self.assertEqual(rater.values[2 * 9 + 5], grid[2][5])
+
+        puzzles = list(gradedPuzzles(4, 2, seed=1, bins=["easy"]))
+        self.assertEqual([ difficulty for difficulty, puzzle, solution in puzzles ], ["easy", "easy"])
+
+
+    def test_augmentBoard(self):
+        """
+        Tests that augmented boards are distinct and still follow the rules,
+        and that relabeling doesn't change the canonical form.
+        """
+        grid = Generator(9, seed=6).generate()
+        boards = list(augmentBoard(grid, 20, seed=1))
+        self.assertEqual(len(boards), 20)
+        self.assertEqual(len({ tuple(map(tuple, board)) for board in boards + [grid] }), 21)
+
+        table = getPeerTable(9)
+        for board in boards:
+            for unit in table.units:
+                self.assertEqual(sorted(board[x][y] for x, y in unit), list(range(1, 10)))
+
+        relabeled = [ [ 10 - value for value in column ] for column in grid ]
+        self.assertEqual(canonicalForm(relabeled), canonicalForm(grid))
+
+
+    def test_cliResume(self):
+        """
+        Tests that an interrupted board file resumes into the same file
+        an uninterrupted run writes.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            whole = os.path.join(folder, "whole.txt")
+            resumed = os.path.join(folder, "resumed.txt")
+            cli.main(["generate", "--size", "4", "--count", "6", "--out", whole, "--seed", "3", "--workers", "1"])
+            cli.main(["generate", "--size", "4", "--count", "4", "--out", resumed, "--seed", "3", "--workers", "1"])
+
+            # Cut the last board off halfway
+            with open(resumed, "r+") as file:
+                file.truncate(os.path.getsize(resumed) - 10)
+            self.assertEqual(countRecords(resumed), 3)
+
+            cli.main(["generate", "--size", "4", "--count", "6", "--out", resumed, "--workers", "1"])
+            with open(whole) as file_a, open(resumed) as file_b:
+                self.assertEqual(file_a.read(), file_b.read())
+
+
+    def test_packedCorpus(self):
+        """
+        Tests that boards and puzzles read back from a packed file as written,
+        for both 4-bit and byte cells.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            for size in [9, 25]:
+                path = os.path.join(folder, f"{size}.bin")
+                grids = [ Generator(size, seed=seed, naked_singles=True, hidden_singles=True).generate() for seed in range(3) ]
+                puzzle = [ [ value if (x + y) % 3 else None for y, value in enumerate(column) ] for x, column in enumerate(grids[1]) ]
+
+                writer = PackedWriter(path, size, seed=7, num_to_remove=1)
+                for seed, grid in enumerate(grids):
+                    writer.write(seed, puzzle if seed == 1 else grid, grid)
+                writer.close()
+
+                with PackedCorpus(path) as corpus:
+                    self.assertEqual(len(corpus), 3)
+                    self.assertEqual(corpus.seed, 7)
+                    self.assertEqual([ corpus[i] for i in range(3) ], grids)
+                    self.assertEqual(corpus.boardSeed(2), 2)
+                    self.assertEqual(corpus.puzzle(1), puzzle)
+
+                # A view still holding the map doesn't stop the corpus from closing
+                corpus = PackedCorpus(path)
+                view = memoryview(corpus.map)
+                corpus.close()
+                self.assertEqual(view[:4].tobytes(), b"SWCF")
+                view.release()
+
+
+    @unittest.skipIf(numpy == None, "NumPy is not installed")
+    def test_numpyArrays(self):
+        """
+        Tests that packed boards read back as arrays (zero-copy for byte cells)
+        that outlive the corpus, and that batch augmentation keeps the rules.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            for size in [9, 25]:
+                path = os.path.join(folder, f"{size}.bin")
+                grid = Generator(size, seed=1, naked_singles=True, hidden_singles=True).generate()
+                writer = PackedWriter(path, size, seed=7)
+                writer.write(1, None, grid)
+                writer.close()
+
+                with PackedCorpus(path) as corpus:
+                    array = corpus.array(0)
+                self.assertEqual(array.tolist(), grid)
+
+        grid = Generator(9, seed=6).generate()
+        boards = augmentBatch(grid, 20, seed=1)
+        self.assertEqual(boards.shape, (20, 9, 9))
+        table = getPeerTable(9)
+        for board in boards.tolist():
+            for unit in table.units:
+                self.assertEqual(sorted(board[x][y] for x, y in unit), list(range(1, 10)))
+
+
+    def test_traceReplay(self):
+        """
+        Tests that replaying a trace rebuilds the generated board, and that
+        the trace counts the same backtracks and restarts as the Generator.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "trace.bin")
+            generator = Generator(16, seed=2, restart_base=5, naked_singles=True, trace=TraceRecorder(path, sample_every=10))
+            grid = generator.generate()
+
+            size, events = readTrace(path)
+            self.assertEqual(replayTrace(size, events), grid)
+
+            counts, backtracks_by_depth = summarizeTrace(readTrace(path)[1])
+            self.assertEqual(counts["backtrack"], sum(backtracks_by_depth.values()))
+            self.assertEqual(counts["restart"], generator.restarts)
+            self.assertTrue(counts["propagate"] < counts["decide"])
+
+
+    def test_seededDeterminism(self):
+        """
+        Tests that a seed always gives the same board along the same search path,
+        and that a board generated without a seed can be generated again from
+        the seed it records.
+        """
+        first = Generator(16, seed=11, restart_base=5)
+        second = Generator(16, seed=11, restart_base=5)
+        self.assertEqual(list(first.steps()), list(second.steps()))
+        self.assertEqual((first.backtracks, first.restarts), (second.backtracks, second.restarts))
+
+        controller = Controller(Model(), seed=None)
+        seed, grid = controller.generateSudoku(9)
+        self.assertEqual(Generator(9, seed).generate(), grid)
+
+        boards = [ Controller(Model(), seed=5).generateSudoku(9) for i in range(2) ]
+        self.assertEqual(boards[0], boards[1])
+
+
+    def test_benchmarkBaseline(self):
+        """
+        Tests that fixed-seed benchmarks repeat their search exactly, and that
+        a run much slower than the baseline is reported as a regression.
+        """
+        run = benchmarkGeneration(9, 1)
+        self.assertEqual(run["steps"], benchmarkGeneration(9, 1)["steps"])
+        self.assertEqual(run["peak_history"], 81)   # One decision per Tile
+
+        baseline = { "generation": { "9": [dict(run, wall_time=0.001)] }, "methods": { "getValidTiles": 10.0 } }
+        slow = { "generation": { "9": [dict(run, wall_time=0.5)] }, "methods": { "getValidTiles": 11.0 } }
+        self.assertEqual(len(compareToBaseline(slow, baseline, 1.5)), 1)
+        self.assertEqual(compareToBaseline(baseline, baseline, 1.5), [])
+
+        # One noisy seed doesn't fail the size when the total is within the threshold
+        baseline = { "generation": { "25": [ dict(run, wall_time=0.066) for i in range(3) ] }, "methods": {} }
+        noisy = { "generation": { "25": [ dict(run, wall_time=0.101) ] + [ dict(run, wall_time=0.066) for i in range(2) ] }, "methods": {} }
+        self.assertEqual(compareToBaseline(noisy, baseline, 1.5), [])
+
+
+    def test_metrics(self):
+        """
+        Tests that the metrics agree with the board and the trace, and that the
+        callback is called every metrics_every nodes.
+        """
+        calls = []
+        trace = TraceRecorder()
+        generator = Generator(16, seed=2, restart_base=5, naked_singles=True, trace=trace,
+                              metrics_callback=lambda metrics: calls.append(metrics.nodes), metrics_every=100)
+        generator.generate()
+
+        metrics = generator.metrics
+        counts, backtracks_by_depth = summarizeTrace(trace.events)
+        self.assertEqual(metrics.decisions, counts["decide"])
+        self.assertEqual(metrics.forced, counts["force"])
+        self.assertEqual(metrics.contradictions, counts["conflict"])
+        self.assertEqual(metrics.zero_entropy, counts["reject"])
+        self.assertEqual(metrics.restarts, generator.restarts)
+        self.assertTrue(0 < metrics.max_depth <= 16 * 16)
+        self.assertEqual(calls, list(range(100, metrics.nodes + 1, 100)))
+        self.assertTrue(metrics.domain_removals >= metrics.propagations > 0)
+
+
+    def test_profilePhases(self):
+        """
+        Tests that the profile report splits the time into phases without
+        counting nested calls twice.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            profiler = Profiler(os.path.join(folder, "log.profile"))
+            with profiler.profile():
+                Generator(25, seed=1, naked_singles=True, hidden_singles=True).generate()
+            paths = profiler.write()
+            self.assertEqual([ os.path.basename(path) for path in paths ], ["log.profile.pstats", "log.profile.txt"])
+
+            with open(paths[1]) as file:
+                report = file.read()
+            shares = { line[:24].strip(): float(line.split()[-1][:-1]) for line in report.splitlines()[3:10] }
+            self.assertTrue(shares["Propagation"] > 0)
+            self.assertTrue(sum(shares.values()) <= 100.5)
+
+        # Logging at the end of a drain counts as Logging only, even through an untagged caller
+        class FakeStats():
+            pass
+        drain = ("view/View.py", 1, "drainChanges")
+        finish = ("view/View.py", 2, "finishGeneration")
+        log = ("logger/logger.py", 3, "log")
+        stats = FakeStats()
+        stats.stats = { drain: (1, 1, 0.1, 1.0, {}),
+                        finish: (1, 1, 0.1, 0.6, { drain: (1, 1, 0.1, 0.6) }),
+                        log: (1, 1, 0.5, 0.5, { finish: (1, 1, 0.5, 0.5) }) }
+        times = phaseTimes(stats)
+        self.assertAlmostEqual(times["Rendering"], 0.5)
+        self.assertAlmostEqual(times["Logging"], 0.5)
+
+
+    def test_headlessImports(self):
+        """
+        Tests that the engine layers load without the GUI stack or the process pools.
+        """
+        code = ("import sys\n"
+                "import controller.Controller, model.Model, snapshot.Snapshot, tile.Tile, generator.Batch\n"
+                "print(' '.join(name for name in ('tkinter', 'PIL', 'colorama', 'concurrent.futures') if name in sys.modules))")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
+
+    def test_profileWorkerThread(self):
+        """
+        Tests that a worker thread can be profiled while the main thread's
+        profile is running (on Python 3.12+ the outer profile covers it),
+        and that the worker's time ends up in the report.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            profiler = Profiler(os.path.join(folder, "log.profile"))
+            errors = []
+
+            def work():
+                try:
+                    with profiler.profile():
+                        Generator(16, seed=1).generate()
+                except Exception as error:
+                    errors.append(error)
+
+            with profiler.profile():
+                worker = Thread(target=work)
+                worker.start()
+                worker.join()
+            self.assertEqual(errors, [])
+
+            paths = profiler.write()
+            with open(paths[1]) as file:
+                report = file.read()
+            shares = { line[:24].strip(): float(line.split()[-1][:-1]) for line in report.splitlines()[3:10] }
+            self.assertTrue(shares["Propagation"] > 0)
+
+
+    def test_peerTable(self):
+        """
+        Tests that every coord in a 9x9 peer table has the 20 expected peers.
+        """
+        table = getPeerTable(9)
+
+        peers = table.peers[4][7]
+        self.assertEqual(len(peers), 20)
+        self.assertEqual(len(set(peers)), 20)
+        self.assertNotIn((4, 7), peers)
+        self.assertIn((4, 0), peers)    # Same column
+        self.assertIn((0, 7), peers)    # Same row
+        self.assertIn((3, 6), peers)    # Same subsquare
+
+        # The table is only built once per size
+        self.assertIs(getPeerTable(9), table)
+
+
+    def test_entropyBitmask(self):
+        """
+        Tests the bitmask entropy helpers at the largest board size.
+        """
+        entropy = fullEntropy(49)
+        self.assertEqual(entropyCount(entropy), 49)
+
+        entropy = removeValue(entropy, 49)
+        entropy = removeValue(entropy, 1)
+        self.assertFalse(hasValue(entropy, 49))
+        self.assertTrue(hasValue(entropy, 2))
+        self.assertEqual(entropyValues(entropy), list(range(2, 49)))
+        self.assertEqual(fromValues(entropyValues(entropy)), entropy)
+
+
+    def test_loggerWriter(self):
+        """
+        Tests that the Logger's writer thread writes every queued log in order,
+        rotating the file once it grows too big, and drains the queue on stop.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "log.txt")
+            queue = Queue()
+            writer = Thread(target=writeLoop, args=(queue, path, 100, 5, 30, 60))
+            writer.start()
+            for i in range(20):
+                queue.put(f"line {i:02}\n")    # 8 bytes each
+                if i % 4 == 3:
+                    flushed = Event()
+                    queue.put(flushed)
+                    flushed.wait()
+            queue.put(STOP)
+            writer.join()
+
+            contents = ""
+            for backup in range(5, 0, -1):
+                if os.path.exists(f"{path}.{backup}"):
+                    with open(f"{path}.{backup}") as file:
+                        contents += file.read()
+            with open(path) as file:
+                contents += file.read()
+
+            self.assertTrue(os.path.exists(f"{path}.1"))
+            self.assertTrue(os.path.getsize(path) <= 100)
+            self.assertEqual(contents, "".join(f"line {i:02}\n" for i in range(20)))
+
+
     def test_singletonLogger(self):
         """
         Tests if the singleton implementation of the Logger works properly.
@@ -0,0 +1,81 @@
+"""
+A Tile's entropy (the values it is still allowed to hold) is stored as an
+integer bitmask: the value v is allowed when bit (v - 1) is set.
+
+For board sizes up to 49 the whole entropy fits in one small int, so
+counting, removing, excluding, and restoring values are single integer
+operations instead of list scans.
+
+These functions are the readable way to work with the layout, and the
+Model, View, and tests use them. The hot loops of the Generator, Solver,
+and Rater (propagation, the singles and pairs rules, EntropyBuckets
+counts) work on the masks directly instead, with int.bit_count() for the
+number of values, mask & -mask for the lowest one, bit.bit_length() for
+a single bit's value, and & ~ to remove values, to save a function call
+per Tile. Any change to the layout has to be made there as well.
+"""
+from typing import List
+
+
+def valueBit(value: int):
+    """
+    Returns the mask with only the given value's bit set.
+    """
+    return 1 << (value - 1)
+
+
+def fullEntropy(size: int):
+    """
+    Returns the entropy of an empty Tile: every value from 1 to size.
+    """
+    return (1 << size) - 1
+
+
+def fromValues(values: List[int]):
+    """
+    Returns the entropy holding exactly the given values.
+    """
+    mask = 0
+    for value in values:
+        mask |= 1 << (value - 1)
+    return mask
+
+
+def entropyCount(mask: int):
+    """
+    Returns the number of values in the entropy.
+    """
+    return mask.bit_count()
+
+
+def hasValue(mask: int, value: int):
+    """
+    Returns True if the value is in the entropy.
+    """
+    return (mask >> (value - 1)) & 1 == 1
+
+
+def removeValue(mask: int, value: int):
+    """
+    Returns the entropy without the given value.
+    """
+    return mask & ~(1 << (value - 1))
+
+
+def addValue(mask: int, value: int):
+    """
+    Returns the entropy with the given value restored.
+    """
+    return mask | (1 << (value - 1))
+
+
+def entropyValues(mask: int):
+    """
+    Returns a list of the values in the entropy, smallest first.
+    """
+    values = []
+    while mask:
+        lowest_bit = mask & -mask
+        values.append(lowest_bit.bit_length())
+        mask ^= lowest_bit
+    return values
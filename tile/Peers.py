@@ -0,0 +1,71 @@
+from functools import lru_cache
+from math import isqrt      # For the square root function
+
+
+class PeerTable():
+    """
+    Stores, for every coordinate of a board, the coordinates of the other
+    Tiles that share its row, column, or subsquare (its peers).
+
+    Every list is indexed as table[x][y], matching the tile grid.
+    Build it through getPeerTable() so each board size is only built once.
+
+    It also lists the units themselves (every column, row, and subsquare as
+    a list of coords) and, for each coord, the indices of its three units.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        subsquare_size = isqrt(size)
+
+        self.row_peers = []        # Other coords with the same y
+        self.column_peers = []     # Other coords with the same x
+        self.subsquare_peers = []  # Other coords in the same subsquare
+        self.peers = []            # Union of the three above, without duplicates
+
+        for x in range(size):
+            row_list = []
+            column_list = []
+            subsquare_list = []
+            peer_list = []
+            for y in range(size):
+                rows = [ (other_x, y) for other_x in range(size) if other_x != x ]
+                columns = [ (x, other_y) for other_y in range(size) if other_y != y ]
+
+                sub_x = (x // subsquare_size) * subsquare_size
+                sub_y = (y // subsquare_size) * subsquare_size
+                subsquares = [ (sub_x+i, sub_y+j) for i in range(subsquare_size) for j in range(subsquare_size)
+                               if (sub_x+i, sub_y+j) != (x, y) ]
+
+                # Subsquare peers that are not already in the row or column
+                box_only = [ coord for coord in subsquares if coord[0] != x and coord[1] != y ]
+
+                row_list.append(rows)
+                column_list.append(columns)
+                subsquare_list.append(subsquares)
+                peer_list.append(rows + columns + box_only)
+
+            self.row_peers.append(row_list)
+            self.column_peers.append(column_list)
+            self.subsquare_peers.append(subsquare_list)
+            self.peers.append(peer_list)
+
+        # Units are ordered columns, then rows, then subsquares
+        self.units = []
+        for x in range(size):
+            self.units.append([ (x, y) for y in range(size) ])
+        for y in range(size):
+            self.units.append([ (x, y) for x in range(size) ])
+        for sub_x in range(0, size, subsquare_size):
+            for sub_y in range(0, size, subsquare_size):
+                self.units.append([ (sub_x+i, sub_y+j) for i in range(subsquare_size) for j in range(subsquare_size) ])
+
+        self.cell_units = [ [ (x, size + y, 2*size + (x // subsquare_size) * subsquare_size + (y // subsquare_size))
+                              for y in range(size) ] for x in range(size) ]
+
+
+@lru_cache(maxsize=None)
+def getPeerTable(size: int):
+    """
+    Returns the PeerTable for the given board size, building it on first use.
+    """
+    return PeerTable(size)
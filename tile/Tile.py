@@ -1,15 +1,20 @@
-from tkinter import Frame, Label
+from tile.Entropy import fullEntropy
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING: # Only needed for type hints; keeps Tile importable without tkinter
+    from tkinter import Frame, Label
 
 
 class Tile():
     """
     This class stores data on each individual tile in the tile grid.
+    Headless code (such as the Generator) passes None for the frame and label.
     """
-    def __init__(self, frame: Frame, label: Label, subsquare: (int), tiles: int, x: int, y: int):
+    def __init__(self, frame: 'Frame', label: 'Label', subsquare: (int), tiles: int, x: int, y: int):
         self.frame = frame
         self.label = label  # The tile image displayed
         self.subsquare = subsquare
-        self.entropy = [ num+1 for num in range(tiles) ]    # Numbers that are allowed to go in the given Tile
+        self.entropy = fullEntropy(tiles)    # Bitmask of the numbers that are allowed to go in the given Tile (see tile/Entropy.py)
         self.collapsed = False
         self.coord = (x, y)
         self.value = None
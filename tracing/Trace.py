@@ -0,0 +1,146 @@
+"""
+Compact traces of a Generator's search, and a replayer for them.
+
+A trace is a small header (magic "SWCT", board size) followed by 8 byte
+events: kind, x, y, value (one byte each) and one uint32 of extra data.
+
+    DECIDE      x, y, value, depth      a Tile was chosen and collapsed
+    FORCE       x, y, value             propagation collapsed a Tile
+    UNFORCE     x, y                    a forced Tile was cleared by backtracking
+    REJECT      x, y, value             a decision was undone (zero entropy peer)
+    CONFLICT    x, y, value             a decision was undone (propagation rules failed)
+    BACKTRACK   x, y, depth             a decision was popped off the history
+    RESTART     restart number          the board was cleared to start over
+    PROPAGATE   x, y, value, removals   a decision's propagation finished
+
+Every event but PROPAGATE changes the board, so they are always recorded;
+PROPAGATE events are only diagnostic and can be sampled to keep traces small.
+"""
+import struct
+
+
+HEADER = struct.Struct("<4sB3x")
+EVENT = struct.Struct("<BBBBI")
+MAGIC = b"SWCT"
+
+DECIDE = 0
+FORCE = 1
+UNFORCE = 2
+REJECT = 3
+CONFLICT = 4
+BACKTRACK = 5
+RESTART = 6
+PROPAGATE = 7
+
+EVENT_NAMES = ["decide", "force", "unforce", "reject", "conflict", "backtrack", "restart", "propagate"]
+
+
+class TraceRecorder():
+    """
+    Collects a Generator's events, in memory or in a file.
+
+    Pass one to Generator(trace=...). Only every sample_every-th PROPAGATE
+    event is kept; everything needed to replay the board always is.
+    """
+    def __init__(self, file_path=None, sample_every=1):
+        self.file_path = file_path
+        self.sample_every = sample_every
+        self.file = None
+        self.events = []        # Events kept in memory when there is no file
+        self.size = None
+        self.propagations = 0
+
+
+    def begin(self, size: int):
+        """
+        Starts a new trace for a board of the given size (dropping any earlier one).
+        """
+        self.size = size
+        self.events = []
+        self.propagations = 0
+        if self.file_path != None:
+            if self.file != None:
+                self.file.close()
+            self.file = open(self.file_path, "wb")
+            self.file.write(HEADER.pack(MAGIC, size))
+
+
+    def record(self, kind: int, x=0, y=0, value=0, extra=0):
+        """
+        Adds one event to the trace.
+        """
+        if kind == PROPAGATE:
+            self.propagations += 1
+            if self.propagations % self.sample_every:
+                return
+
+        if self.file != None:
+            self.file.write(EVENT.pack(kind, x, y, value or 0, extra))
+        else:
+            self.events.append((kind, x, y, value or 0, extra))
+
+
+    def close(self):
+        if self.file != None:
+            self.file.close()
+            self.file = None
+
+
+def readTrace(file_path: str):
+    """
+    Returns the (size, events) of a trace file, where events is an iterator
+    of (kind, x, y, value, extra) tuples that reads the file as it goes.
+    """
+    file = open(file_path, "rb")
+    magic, size = HEADER.unpack(file.read(HEADER.size))
+    if magic != MAGIC:
+        file.close()
+        raise Exception(f"{file_path} is not a trace file!")
+
+    def events():
+        with file:
+            while True:
+                block = file.read(EVENT.size * 4096)
+                if not(block):
+                    return
+                yield from EVENT.iter_unpack(block[:len(block) - len(block) % EVENT.size])
+
+    return size, events()
+
+
+def replayTrace(size: int, events, upto=None):
+    """
+    Rebuilds the board after the first upto events (all of them if None).
+    Returns the grid of values, indexed as grid[x][y] (None for empty Tiles).
+    """
+    grid = [ [ None ] * size for x in range(size) ]
+
+    for index, (kind, x, y, value, extra) in enumerate(events):
+        if upto != None and index >= upto:
+            break
+
+        if kind == DECIDE or kind == FORCE:
+            grid[x][y] = value
+        elif kind == RESTART:
+            grid = [ [ None ] * size for x in range(size) ]
+        elif kind != PROPAGATE:
+            grid[x][y] = None
+
+    return grid
+
+
+def summarizeTrace(events):
+    """
+    Counts the events of each kind and the backtracks at each history depth
+    (a pile of backtracks at one depth is where the search thrashed).
+    Returns a (counts, backtracks_by_depth) tuple of dicts.
+    """
+    counts = { name: 0 for name in EVENT_NAMES }
+    backtracks_by_depth = {}
+
+    for kind, x, y, value, extra in events:
+        counts[EVENT_NAMES[kind]] += 1
+        if kind == BACKTRACK:
+            backtracks_by_depth[extra] = backtracks_by_depth.get(extra, 0) + 1
+
+    return (counts, backtracks_by_depth)
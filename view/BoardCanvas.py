@@ -0,0 +1,91 @@
+from tkinter import Canvas, NW
+from math import isqrt      # For the square root function
+
+
+class BoardCanvas():
+    """
+    Draws the whole Sudoku board on one Canvas: one image item per Tile,
+    with the Tile and subsquare borders drawn as lines on top.
+
+    Changes are only remembered when they are made; the cells that changed
+    are redrawn together at most once per frame (frame_ms milliseconds),
+    so a burst of changes costs one redraw and unchanged cells cost nothing.
+    """
+    def __init__(self, parent, size: int, tile_size: int, images, frame_ms=16):
+        self.size = size
+        self.tile_size = tile_size
+        self.images = images    # The shared, lazily loaded tile images
+        self.frame_ms = frame_ms
+
+        board_size = size * tile_size
+        self.canvas = Canvas(parent, width=board_size, height=board_size, bg="black", highlightthickness=0)
+
+        # One image item per Tile, all starting blank
+        self.items = [ [ self.canvas.create_image(x * tile_size, y * tile_size, anchor=NW, image=images[0])
+                         for y in range(size) ] for x in range(size) ]
+        self.shown = [ [ None ] * size for x in range(size) ]   # The value each item displays
+
+        # Tile borders, then the thicker subsquare borders
+        subsquare_size = isqrt(size)
+        for i in range(size + 1):
+            if i % subsquare_size:
+                self.drawLines(i * tile_size, "#000066", 1)
+        for i in range(0, size + 1, subsquare_size):
+            self.drawLines(i * tile_size, "blue", 2)
+
+        self.dirty = {}         # (x, y) -> value still to be drawn
+        self.pending = None     # The scheduled redraw, if any
+
+
+    def drawLines(self, position: int, color: str, width: int):
+        """
+        Draws one vertical and one horizontal border line across the board.
+        """
+        end = self.size * self.tile_size
+        self.canvas.create_line(position, 0, position, end, fill=color, width=width)
+        self.canvas.create_line(0, position, end, position, fill=color, width=width)
+
+
+    def pack(self, **options):
+        self.canvas.pack(**options)
+
+
+    def setTile(self, x: int, y: int, value):
+        """
+        Shows the value (None for blank) in the Tile at the next redraw.
+        """
+        self.dirty[(x, y)] = value
+        if self.pending == None:
+            self.pending = self.canvas.after(self.frame_ms, self.redraw)
+
+
+    def clear(self):
+        """
+        Blanks every Tile at the next redraw.
+        """
+        for x in range(self.size):
+            for y in range(self.size):
+                self.setTile(x, y, None)
+
+
+    def redraw(self):
+        """
+        Draws every changed Tile whose displayed value is out of date.
+        """
+        self.pending = None
+        dirty = self.dirty
+        self.dirty = {}
+
+        for (x, y), value in dirty.items():
+            if self.shown[x][y] != value:
+                self.shown[x][y] = value
+                self.canvas.itemconfigure(self.items[x][y], image=self.images[value or 0])
+
+
+    def flush(self):
+        """
+        Draws the pending changes right away.
+        """
+        if self.pending != None:
+            self.canvas.after_cancel(self.pending)
+            self.redraw()
@@ -0,0 +1,65 @@
+"""
+The Flyweight list of tile images, loaded lazily and cached on disk.
+
+Resizing the source PNGs is the slow part of starting the app, so each
+resized image is saved in a cache folder under a name made of the tile
+size and the source file's modification time. Later launches load that
+file straight into a PhotoImage (without PIL), and an edited source image
+simply gets a new cache entry.
+"""
+from tkinter import PhotoImage
+import os
+
+
+IMAGE_FOLDER = "./tile/tile_images"
+CACHE_FOLDER = "./tile/image_cache"
+
+
+class TileImages():
+    """
+    Acts like the list of tile images (index 0 is BLANK, index v is the value v),
+    but only loads an image the first time it is asked for.
+    """
+    def __init__(self, tile_size: int, size: int, image_folder=IMAGE_FOLDER, cache_folder=CACHE_FOLDER):
+        self.tile_size = tile_size
+        self.size = size
+        self.image_folder = image_folder
+        self.cache_folder = cache_folder
+        self.images = {}    # Loaded PhotoImages by index
+
+
+    def __len__(self):
+        return self.size + 1
+
+
+    def __getitem__(self, index: int):
+        if index not in self.images:
+            if not(0 <= index <= self.size):
+                raise IndexError("No tile image for that value!")
+            self.images[index] = PhotoImage(file=self.cachedPath(index))
+        return self.images[index]
+
+
+    def cachedPath(self, index: int):
+        """
+        Returns the path of the resized image for the index, resizing the
+        source image into the cache first if it isn't there yet.
+        """
+        name = "BLANK" if index == 0 else str(index)
+        source = os.path.join(self.image_folder, f"tile{name}.png")
+        mtime = os.stat(source).st_mtime_ns
+        cached = os.path.join(self.cache_folder, f"tile{name}_{self.tile_size}_{mtime}.png")
+
+        if not(os.path.exists(cached)):
+            from PIL import Image   # Only needed when the cache is cold
+
+            os.makedirs(self.cache_folder, exist_ok=True)
+            image = Image.open(source)                                          # Open the image for editting
+            image = image.resize((self.tile_size, self.tile_size), Image.LANCZOS) # Resize the image based on the tile size
+
+            # Write to a temporary name first so a crash can't leave half an image behind
+            temporary = f"{cached}.{os.getpid()}.tmp"
+            image.save(temporary, "PNG")
+            os.replace(temporary, cached)
+
+        return cached
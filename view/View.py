@@ -1,33 +1,44 @@
 from controller.Controller import Controller
 from logger.logger import Logger
 from tile.Tile import Tile
+from view.TileImages import TileImages
+from view.BoardCanvas import BoardCanvas
+from tile.Entropy import entropyCount, fullEntropy, hasValue
 from math import isqrt, floor   # For the square root and floor functions
 from tkinter import *
 import datetime                 # For getting the date and time for the logs
-import time                     # For delaying in order to achieve animation
+from threading import Thread, Event  # For running the Generator off the Tk thread
+from queue import Queue, Empty  # For handing its changes to the Tk thread
 import os                       # For getting the dimensions of the user's screen
-from PIL import Image, ImageTk  # For resizing images
-from snapshot.Snapshot import Snapshot
-from colorama import Fore, Style    # For colorizing debugging output
+from typing import List
 
 
 class View():
     
-    def __init__(self, controller: Controller):
+    def __init__(self, controller: Controller, profiler=None):
         """
         Creates a view to be interacted with by the user and
         to display the Sudoku generation results.
+        With a Profiler, the generation worker threads are profiled too.
         """
         self.program_start = True # Buttons run command when GUI is being made; this avoids that
         self.controller = controller
         self.logger = Logger("./log.txt")
+
+        # The Generator runs on a worker thread and queues its changes for the Tk thread
+        self.worker = None          # The running worker thread, if any
+        self.changes = None         # The running worker's queue of changes
+        self.cancel = None          # Set to stop the running worker
+        self.step_event = Event()   # Set by the Next Step button
+        self.frame_ms = 16          # Milliseconds between draws (about 60 per second)
+        self.profiler = profiler
         print("\nChoose your Sudoku size:")
         print("- 4x4   (enter \'4\')")
         print("- 9x9   (enter \'9\')   (STANDARD)")
         print("- 16x16 (enter \'16\')")
-        print("- 25x25 (enter \'25\')  (MAY TAKE LONG; IF SO, TRY AGAIN)")
-        print("- 36x36 (enter \'36\')  (NOT IN OUR LIFETIME)")
-        print("- 49x49 (enter \'49\')  (\"\")")
+        print("- 25x25 (enter \'25\')  (MAY TAKE A FEW SECONDS)")
+        print("- 36x36 (enter \'36\')  (\"\")")
+        print("- 49x49 (enter \'49\')  (MAY TAKE LONG)")
         self.tiles_for_width = int(input("\nChoice: "))
         self.subsquares_along_width = isqrt(self.tiles_for_width)
         print()
@@ -97,8 +108,7 @@ class View():
         button_step_generate = Button(self.button_frame, width=10, height=2, text="Step Generate", bg=bg_color, fg=fg_color, activebackground=act_back, activeforeground=act_fore, command=self.generateWithSteps)
         button_step_generate.pack(side=LEFT)
 
-        self.wait_var = IntVar()
-        self.button_next_step = Button(self.button_frame, width=10, height=2, text="Next Step", bg=bg_color, fg=fg_color, activebackground=act_back, activeforeground=act_fore, command=lambda: self.wait_var.set(1)) # The lambda function is borrowed from an external source.
+        self.button_next_step = Button(self.button_frame, width=10, height=2, text="Next Step", bg=bg_color, fg=fg_color, activebackground=act_back, activeforeground=act_fore, command=self.step_event.set)
         self.button_next_step.pack(side=LEFT)
 
         button_gamify = Button(self.button_frame, width=10, height=2, text="Gamify", bg=bg_color, fg=fg_color, activebackground=act_back, activeforeground=act_fore, command=self.gamify)
@@ -111,15 +121,17 @@ class View():
         button_stop.pack(side=LEFT)
 
 
-        # Make the frame for the Sudoku board
-        self.sudokuBoard = Frame(self.root, width=board_size, height=board_size, bg="#8c8c8c")
-        self.sudokuBoard.pack()
-        self.subsquare_grid = self.makeSubsquares(board_size)
-        self.tile_grid = self.populateGrid(tile_size) # Initialize grid with empty Tiles
-
-        # Get a list of resized possible tile images (BLANK and 1-9)
+        # Get a lazily loaded list of resized possible tile images (BLANK and 1-9)
         self.image_list = self.resizeImages(tile_size)
 
+        # Draw the Sudoku board on a single canvas
+        self.board = BoardCanvas(self.root, self.tiles_for_width, tile_size, self.image_list)
+        self.board.pack()
+        self.tile_grid = self.populateGrid() # Initialize grid with empty Tiles
+
+        # The headless engine that produces every board this View displays
+        self.generator = self.controller.makeGenerator(self.tiles_for_width)
+
         # Initialize the Sudoku board as empty
         self.generateEmptyBoard()
 
@@ -162,34 +174,83 @@ class View():
     def gamify(self):
         """
         Will request the controller to choose a random set of
-        tiles equivalent to 63% of the total number of tiles 
+        tiles equivalent to (at most) 63% of the total number of tiles 
         to make empty to allow the Sudoku puzzle to be playable.
+        Tiles are only cleared while the puzzle keeps a unique solution.
 
         I can modify this in the future to allow for the number of
         removed Tiles to be chosen based on difficulty.
         """
+        if self.worker != None: # Wait for the board to finish generating (or gamifying)
+            return
+
         # Determine how many tiles is 63% of total tiles (ideal for good game)
         total_tiles = self.tiles_for_width * self.tiles_for_width
         num_tiles_to_remove = floor(total_tiles * 0.63)
 
-        # Get list of Tile coordinates to clear
-        clear_list = self.controller.getGamifyTiles(num_tiles_to_remove, self.tile_grid)
+        # Checking uniqueness takes a while on big boards, so the Tiles are
+        # chosen on a worker thread and cleared as they come in
+        grid = [ [ tile.value for tile in column ] for column in self.tile_grid ]
+        self.changes = Queue()
+        self.cancel = Event()
+
+        self.worker = Thread(target=self.runGamify, args=(self.changes, self.cancel, grid, num_tiles_to_remove), daemon=True)
+        self.worker.start()
+        self.root.after(self.frame_ms, self.drainChanges, self.changes, self.frame_ms, None, self.finishGamify)
+
 
-        # Clear the tiles in the clear_list
-        for x, y in clear_list:
-            self.tile_grid[x][y].label['image'] = self.image_list[0]
+    def runGamify(self, changes: Queue, cancel: Event, grid: List[List[int]], num_to_remove: int):
+        """
+        Runs on the worker thread: queues a change clearing each Tile the
+        controller picks, until it is done or cancel is set. None is queued
+        last, even if the profiler or the Model fails.
+        """
+        try:
+            if self.profiler != None:
+                with self.profiler.profile():
+                    return self.gamifySteps(changes, cancel, grid, num_to_remove)
+            return self.gamifySteps(changes, cancel, grid, num_to_remove)
+        finally:
+            changes.put(None)
+
+
+    def gamifySteps(self, changes: Queue, cancel: Event, grid: List[List[int]], num_to_remove: int):
+        """
+        The body of runGamify.
+        """
+        coords = self.controller.streamGamifyTiles(num_to_remove, grid)
+        try:
+            for x, y in coords:
+                if cancel.is_set():
+                    return
+                changes.put((x, y, None))
+        finally:
+            coords.close()
+
+
+    def finishGamify(self):
+        """
+        Logs how many Tiles were cleared once the gamify worker is done.
+        """
+        self.worker.join()
+        self.worker = None
+        self.changes = None
+
+        cleared = sum(1 for column in self.tile_grid for tile in column if tile.value == None)
+        self.logger.log(f'\nGamify cleared {cleared} Tiles\n')
 
 
     def generateEmptyBoard(self):
         """
-        Initializes the sudoku board with empty images.
+        Initializes the sudoku board with empty images
+        (stopping any generation that is still running).
         """
+        self.cancelGeneration()
+        self.board.clear()
         for x in range(self.tiles_for_width):
             for y in range(self.tiles_for_width):
-                # Set the image of the current Tile to the blank image in our image_list
-                self.tile_grid[x][y].label['image'] = self.image_list[0]
                 self.tile_grid[x][y].value = None
-                self.tile_grid[x][y].entropy = [ num+1 for num in range(self.tiles_for_width)]
+                self.tile_grid[x][y].entropy = fullEntropy(self.tiles_for_width)
                 self.tile_grid[x][y].collapsed = False
 
 
@@ -198,129 +259,145 @@ class View():
         Will continue to get generate until a Sudoku board is
         successfully generated (probability decreases rapidly
         as the board size increases).
+
+        The headless Generator does the work on a worker thread, at full
+        speed, and queues each change it reports; the Tk thread drains the
+        queue once per frame (see drainChanges), so the window never freezes.
         """
         if self.program_start: # Dont run if the GUI is laoding up
             return 0
 
-        start = True # To make the first collapsed Tile be in the center
-        backtracking = False # To keep track if we choose the Tile to collapse or not
-        self.history = []
-
-        # Start by clearing the board
+        # Start by clearing the board (this also stops the last generation)
         self.generateEmptyBoard()
 
-        # Continue this loop until every tile has collapsed
-        while True:
-            """
-            Choosing the tile based on if this is the first time running the method,
-            if we are actively backtracking, or if we are proceeding normally.
-            """
-            if start: # Start with collapsing the Tile in the center
-                x = self.tiles_for_width // 2
-                y = self.tiles_for_width // 2
-                chosen_tile = self.tile_grid[x][y]
+        # Every board gets its own seed from the session, so it can be generated again
+        self.generator.reseed(self.controller.nextSeed())
 
-            elif backtracking:
-                chosen_tile = last_snapshot.collapsed_tile
+        self.changes = Queue()
+        self.cancel = Event()
+        self.step_event.clear()
 
-            else: # Get tuple containing random Tile object to populate and value to populate with
-                chosen_tile = self.controller.randomTile(self.tile_grid)
+        # Animation shows the changes at animation_speed seconds apart
+        if animation_flag == 1:
+            delay = max(self.frame_ms, int(self.animation_speed * 1000))
+            per_frame = max(1, round(delay / 1000 / self.animation_speed))
+        else:
+            delay = self.frame_ms
+            per_frame = None    # Everything that is queued
 
-            if chosen_tile == None:
-                break   # No more uncollapsed Tiles, so the board is filled and the loop can end
+        # Keep a few frames of changes queued so the worker doesn't run far ahead of an animation
+        backlog = per_frame * 4 if per_frame != None else None
 
-            
-            if step_flag == 1 and not(start): # Wait for the Next Step button to be pressed before continuing
-                self.root.update()
-                self.button_next_step.wait_variable(self.wait_var)
-                self.wait_var.set(0)
-            
-            start = False
-
-            """
-            Choosing the value to assign to the Tile based on if we are backtracking
-            or if we are proceeding normally.
-            """
-            if backtracking:
-                chosen_value = self.controller.randomValue(chosen_tile, last_snapshot.collapsed_values)
-
-            else:
-                chosen_value = self.controller.randomValue(chosen_tile)
-
-            if chosen_value == None: # After exclusions, no entropy can be chosen; time to backtrack.
-                # Extract the last snapshot and the coord and value
-                if step_flag == 1:
-                    self.button_next_step.wait_variable(self.wait_var)
-                    self.wait_var.set(0)
-
-                last_snapshot = self.history[-1]
-                self.history.pop(-1)
-                backtrack_tile = last_snapshot.collapsed_tile
-                entropy_val_to_reverse = backtrack_tile.value
-
-                # Reset the Tile that needs to be changed
-                backtrack_tile.collapsed = False
-                backtrack_tile.label['image'] = self.image_list[0]
-                backtrack_tile.value = None
-
-                # Go through the Tile grid and restore the entropy from the last snapshot
-                self.reverseEntropy(backtrack_tile, entropy_val_to_reverse)
-                backtracking = True
-
-                if step_flag == 1:
-                    self.button_next_step.wait_variable(self.wait_var)
-                    self.wait_var.set(0)
-
-                continue
-
-            # Mark equivalent Tile in grid as collapsed and assign value to it
-            if not(start):
-                x = chosen_tile.coord[0]
-                y = chosen_tile.coord[1]
-            self.tile_grid[x][y].collapsed = True
-            self.tile_grid[x][y].label['image'] = self.image_list[chosen_value]
-            self.tile_grid[x][y].value = chosen_value
-
-            # Add the new change to history
-            if backtracking:
-                last_snapshot.collapsed_values.append(chosen_value)
-                self.history.append(last_snapshot)
-            else:
-                self.history.append(Snapshot(chosen_tile, chosen_value))
-
-            backtracking = False
-
-            # Backtrack if a tile will have zero entropy after propagation
-            if self.searchZeroEntropyPropagation(chosen_tile, chosen_value) == 1:
-                if step_flag == 1:
-                    self.button_next_step.wait_variable(self.wait_var)
-                    self.wait_var.set(0)
-
-                # Acquire the latest snapshot for backtracking
-                last_snapshot = self.history[-1]
-                self.history.pop(-1)
-
-                # Reset the Tile that needs to be changed
-                self.tile_grid[x][y].collapsed = False
-                self.tile_grid[x][y].label['image'] = self.image_list[0]
-                self.tile_grid[x][y].value = None
+        self.worker = Thread(target=self.runGenerator, args=(self.changes, self.cancel, step_flag == 1, backlog), daemon=True)
+        self.worker.start()
+        self.root.after(delay, self.drainChanges, self.changes, delay, per_frame, self.finishGeneration)
 
-                # Start the cycle again with new exclusions for the values
-                backtracking = True
-                continue
 
+    def runGenerator(self, changes: Queue, cancel: Event, step_mode: bool, backlog):
+        """
+        Runs on the worker thread: queues every change the Generator reports,
+        waiting for the Next Step button between changes in step mode, until
+        the board is done or cancel is set. None is queued last, even if
+        the profiler or the Generator fails, so the drain always finishes.
+        """
+        try:
+            if self.profiler != None:
+                with self.profiler.profile():
+                    return self.runSteps(changes, cancel, step_mode, backlog)
+            return self.runSteps(changes, cancel, step_mode, backlog)
+        finally:
+            changes.put(None)
+
+
+    def runSteps(self, changes: Queue, cancel: Event, step_mode: bool, backlog):
+        """
+        The body of runGenerator.
+        """
+        steps = self.generator.steps()
+        first_step = True
+        try:
+            for change in steps:
+                if step_mode and not(first_step): # Wait for the Next Step button to be pressed before continuing
+                    while not(self.step_event.wait(0.1)):
+                        if cancel.is_set():
+                            return
+                    self.step_event.clear()
+
+                while backlog != None and changes.qsize() > backlog:
+                    if cancel.wait(0.005):
+                        break
+
+                if cancel.is_set():
+                    return
+
+                first_step = False
+                changes.put(change)
+        finally:
+            steps.close()
+
+
+    def drainChanges(self, changes: Queue, delay: int, per_frame, finish):
+        """
+        Runs on the Tk thread every delay milliseconds: draws up to per_frame
+        queued changes (all of them if None), and calls finish once the
+        worker is done.
+        """
+        if changes is not self.changes: # This generation was stopped
+            return
+
+        drawn = 0
+        while per_frame == None or drawn < per_frame:
+            try:
+                change = changes.get_nowait()
+            except Empty:
+                break
+
+            if change == None:
+                self.board.flush()
+                finish()
+                return
+
+            # Mirror the change on the displayed Tile
+            x, y, value = change
+            tile = self.tile_grid[x][y]
+            tile.value = value
+            tile.collapsed = value != None
+            self.board.setTile(x, y, value)
+            drawn += 1
+
+        self.board.flush()
+        self.root.after(delay, self.drainChanges, changes, delay, per_frame, finish)
 
-            # Propagate the entropy of affected Tiles
-            self.propagateEntropy(chosen_tile, chosen_value)
-            
-            # For animation, wait a small amount of time before moving to the next Tile
-            if animation_flag == 1: # Perform animation
-                time.sleep(self.animation_speed)
-                self.root.update()
 
+    def finishGeneration(self):
+        """
+        Logs the finished generation once its worker is done.
+        """
+        self.worker.join()
+        self.worker = None
+        self.changes = None
+
+        self.history = self.generator.history
+        self.logger.log(f'\nSeed: {self.generator.seed}\n')
+        self.logger.log(f'Restarts: {self.generator.restarts}\n')
+        self.logger.log(f'{self.generator.metrics}\n')
         self.logGridEntropyCount()
 
 
+    def cancelGeneration(self):
+        """
+        Stops the running generation, if any, and waits for its worker to finish.
+        """
+        if self.worker == None:
+            return
+
+        self.cancel.set()
+        self.step_event.set()
+        self.worker.join()
+        self.worker = None
+        self.changes = None
+
+
     def searchCollapsed(self):
         """
         Returns the number of collapsed Tiles in the grid.
@@ -372,8 +449,8 @@ class View():
         for column in range(size):
             row_contents = []
             for row in range(size):
-                curr_tile = self.tile_grid[row][column]
-                row_contents.append(len(curr_tile.entropy))
+                curr_tile = self.generator.tile_grid[row][column]
+                row_contents.append(entropyCount(curr_tile.entropy))
 
             self.logger.log(f'{row_contents}\n')
             if doPrint:
@@ -385,6 +462,8 @@ class View():
         Prints the entropy values of each Tile in the grid
         in the log file and terminal for reference.
         """
+        from colorama import Fore, Style   # Only loaded when the colours are needed
+
         size = len(self.tile_grid)
         subsquare_size = int(isqrt(size))
         print()
@@ -392,13 +471,13 @@ class View():
         for column in range(size):
             row_contents = []
             for row in range(size):
-                curr_tile = self.tile_grid[row][column]
+                curr_tile = self.generator.tile_grid[row][column]
 
                 entropy_string = ""
 
                 # Print entropy values by leaving a space in the numberline where value is absent
                 for num_counter in range(1, size+1):
-                    if curr_tile.entropy.count(num_counter) > 0:
+                    if hasValue(curr_tile.entropy, num_counter):
                         entropy_string += (Fore.RED + str(num_counter) + Style.DIM + Style.RESET_ALL)
                     else:
                         entropy_string += (Fore.RED + "." + Style.DIM + Style.RESET_ALL)
@@ -426,140 +505,33 @@ class View():
         print(divider)
 
 
-    def reverseEntropy(self, tile: Tile, entropy_value: int):
-        """
-        Given a reference Tile and a value, this method will add to all
-        necessary Tile's entropy lists the value of entropy_value.
-        For going back in time for backtracking.
-        """
-        size = len(self.tile_grid)
-
-        # Acquire a list of rows, columns, and subsquares that shouldn't be reversed
-        exclude_columns = []
-        exclude_rows = []
-        exclude_subsquares = []
-
-        for column in range(size):
-            for row in range(size):
-                curr_tile = self.tile_grid[column][row]
-                if curr_tile.value == entropy_value:
-                    exclude_columns.append(curr_tile.coord[0])
-                    exclude_rows.append(curr_tile.coord[1])
-                    exclude_subsquares.append(curr_tile.subsquare)
-
-        # Reverse the entropy of Tiles not included in the constraints of the row, column, and subsquare lists
-        for column in range(size):
-            for row in range(size):
-                curr_tile = self.tile_grid[column][row]
-                if (curr_tile.coord[0] == tile.coord[0]) or (curr_tile.coord[1] == tile.coord[1]) or (curr_tile.subsquare == tile.subsquare):
-                    if (exclude_columns.count(curr_tile.coord[0]) == 0) and (exclude_rows.count(curr_tile.coord[1]) == 0) and (exclude_subsquares.count(curr_tile.subsquare) == 0):
-                        if curr_tile.entropy.count(entropy_value) == 0:
-                            curr_tile.entropy.append(entropy_value)
-
-    
-    def searchZeroEntropyPropagation(self, tile, propagation_value: int):
-        """
-        Given a Tile soon to be collapsed and a value to ignore, searches the board to see
-        if any Tile has zero entropy. If so, return 1, else return 0.
-        """
-        size = len(self.tile_grid)
-
-        for column in range(size):
-            for row in range(size):
-
-                curr_tile = self.tile_grid[column][row]
-
-                if (curr_tile.coord[0] == tile.coord[0]) or (curr_tile.coord[1] == tile.coord[1]) or (curr_tile.subsquare == tile.subsquare):
-                    if curr_tile.collapsed == False:
-                        if (len(curr_tile.entropy) == 0):
-                            print("This case shouldn't happen. We should be catching at length 1.")
-                            raise Exception("0 Entropy.")
-                            return 1
-                        elif (len(curr_tile.entropy) == 1) and (curr_tile.entropy.count(propagation_value) > 0):
-                            return 1
-        return 0
-
-    
-    def propagateEntropy(self, tile: Tile, value: int):
-        """
-        Will change the entropy of Tiles surrounding the given Tile based on
-        the given value.
-        """
-        # Iterate through every Tile in the grid
-        for column in range(self.tiles_for_width):
-            for row in range(self.tiles_for_width):
-                curr_tile = self.tile_grid[column][row]
-                if (curr_tile.coord[0] == tile.coord[0]) or (curr_tile.coord[1] == tile.coord[1]) or (curr_tile.subsquare == tile.subsquare):
-                    if curr_tile.entropy.count(value) != 0:
-                        curr_tile.entropy.remove(value)
-   
-
     def resizeImages(self, tile_size: int):
         """
-        Create Image objects for each of the 10 images (BLANK, and 1-9),
-        resize based on size of tile, and store in and return a list to be reused.
+        Returns the shared list of tile images (BLANK, and 1-N) for the tile size.
+        Each image is only loaded the first time a Tile shows it, and resized
+        copies are cached on disk for the next launch (see TileImages).
         """
-        image_list = []
-
-        # Special case: blank image
-        image = Image.open(f"./tile/tile_images/tileBLANK.png")         # Open the image for editting
-        image = image.resize((tile_size, tile_size), Image.LANCZOS)   # Resize the image based on the tile size
-        image = ImageTk.PhotoImage(image)                               # Convert the image to a PhotoImage (tkinter compatable)
-        image_list.append(image)
-
-        # Images 1-9
-        for num in range(self.tiles_for_width):
-            image = Image.open(f"./tile/tile_images/tile{num+1}.png")
-            image = image.resize((tile_size, tile_size), Image.LANCZOS)
-            image = ImageTk.PhotoImage(image)
-            image_list.append(image)
-
-        return image_list
+        return TileImages(tile_size, self.tiles_for_width)
    
 
-    def populateGrid(self, tile_size: int):
+    def populateGrid(self):
         """
-        Creates all of the Tile objects to put in the grid and initializes
-        them with no image and max entropy. Returns the tile grid list.
+        Creates all of the data-only Tile objects that mirror the displayed
+        board and initializes them with no value and max entropy.
+        Returns the tile grid list.
         """
-        #tile_size = tile_size-2
         tile_grid = []  # A two-dimensional list to contain the grid of tiles
-        x_pos = 0
-        prev_sub_x = 0
         for column in range(self.tiles_for_width):
             temp = []
-            y_pos = 0
-            prev_sub_y = 0
             for row in range(self.tiles_for_width):
                 # Calculate which subsquare the Tile is in
-                sub_x = column // isqrt(self.tiles_for_width)
-                sub_y = row // isqrt(self.tiles_for_width)
-                subsquare_coord = (sub_x, sub_y)
-
-                # Check if we have moved down to a new subsquare
-                if sub_y != prev_sub_y:
-                    prev_sub_y = sub_y
-                    y_pos = 0
-                if sub_x != prev_sub_x:
-                    prev_sub_x = sub_x
-                    x_pos = 0
-
-                # Create a frame object
-                temp_frame = Frame(self.subsquare_grid[sub_x][sub_y], width=tile_size, height=tile_size, bg="black", highlightbackground="#000066", highlightthickness=1)
-                temp_frame.place(x=x_pos, y=y_pos)
-
-                # Create a label object
-                temp_label = Label(temp_frame, bg="black")
-                temp_label.place(x=0, y=0)
-
-                # Create the Tile object and add to list of Tiles
-                new_tile = Tile(temp_frame, temp_label, subsquare_coord, self.tiles_for_width, column, row) # tiles_for_width used to initialize entropy
+                subsquare_coord = (column // self.subsquares_along_width, row // self.subsquares_along_width)
+
+                # The board canvas draws the Tile, so it needs no frame or label
+                new_tile = Tile(None, None, subsquare_coord, self.tiles_for_width, column, row) # tiles_for_width used to initialize entropy
                 temp.append(new_tile)
-                y_pos += tile_size
-            
+
             tile_grid.append(temp)
-            y_pos = 0
-            x_pos += tile_size
 
         return tile_grid
 
@@ -568,36 +540,6 @@ class View():
         """
         Shuts down the app.
         """
-        self.wait_var.set(2)
+        self.cancelGeneration()
         self.root.destroy()
-
-
-    def makeSubsquares(self, board_size):
-        """
-        Populates the Sudoku grid with subsquares and returns a two-dimensional list containing
-        all subsquare Frame objects.
-
-        self.sudokuBoard = Frame(self.root, width=board_size, height=board_size, bg="#8c8c8c")
-        self.sudokuBoard.pack()
-        """
-        subsquare_size = board_size // self.subsquares_along_width
-
-        # Create each subsquare frame and store in a two-dimensional list
-        subsquare_grid = []
-        x_pos = 0
-        for column in range(self.subsquares_along_width):
-            temp = []
-            y_pos = 0
-            for row in range(self.subsquares_along_width):
-                new_frame = Frame(self.sudokuBoard, width=subsquare_size, height=subsquare_size, bg="black", highlightbackground="blue", highlightthickness=2)
-                #new_frame = Frame(self.sudokuBoard, width=subsquare_size, height=subsquare_size, bg="black")
-                new_frame.place(x=x_pos, y=y_pos)
-                temp.append(new_frame)
-                y_pos += subsquare_size
-
-            subsquare_grid.append(temp)
-            y_pos = 0
-            x_pos += subsquare_size
-
-        return subsquare_grid
-
+        self.logger.close()